@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+import threading
+import uuid
+from datetime import datetime, timedelta
+
+from sqlalchemy import delete
+from sqlalchemy.orm import Session
+
+try:
+    from .models import AdminSession
+except ImportError:  # Allows running from api folder.
+    from models import AdminSession
+
+
+class AdminSessions:
+    def __init__(self, ttl: float, recheck: float = 5.0) -> None:
+        self.ttl = timedelta(seconds=ttl)
+        self.recheck = timedelta(seconds=recheck)
+        self._lock = threading.Lock()
+        # token -> (expires_at, checked_until)
+        self._expires: dict[str, tuple[datetime, datetime]] = {}
+
+    def create(self, db: Session) -> str:
+        self.purge(db)
+        session = AdminSession(token=str(uuid.uuid4()), created_at=datetime.utcnow())
+        db.add(session)
+        db.commit()
+        with self._lock:
+            self._expires[session.token] = (
+                session.created_at + self.ttl,
+                session.created_at + self.recheck,
+            )
+        return session.token
+
+    def verify(self, db: Session, token: str) -> bool:
+        now = datetime.utcnow()
+        with self._lock:
+            expires_at, checked_until = self._expires.get(token, (None, None))
+        # A cached token is looked up again every `recheck` seconds, so a
+        # logout handled by another process takes effect here too.
+        if expires_at is None or checked_until <= now:
+            session = db.get(AdminSession, token)
+            if session is None:
+                with self._lock:
+                    self._expires.pop(token, None)
+                return False
+            expires_at = session.created_at + self.ttl
+            with self._lock:
+                self._expires[token] = (expires_at, now + self.recheck)
+        if expires_at <= now:
+            self.revoke(db, token)
+            return False
+        return True
+
+    def revoke(self, db: Session, token: str) -> None:
+        with self._lock:
+            self._expires.pop(token, None)
+        db.execute(delete(AdminSession).where(AdminSession.token == token))
+        db.commit()
+
+    def purge(self, db: Session) -> int:
+        now = datetime.utcnow()
+        with self._lock:
+            expired = [
+                token for token, (expires_at, _) in self._expires.items() if expires_at <= now
+            ]
+            for token in expired:
+                del self._expires[token]
+        result = db.execute(delete(AdminSession).where(AdminSession.created_at <= now - self.ttl))
+        db.commit()
+        return result.rowcount
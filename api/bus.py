@@ -0,0 +1,344 @@
+from __future__ import annotations
+
+import json
+import logging
+import os
+import queue
+import socket
+import threading
+import time
+import uuid
+from abc import ABC, abstractmethod
+from typing import Any, Callable
+
+try:
+    from .codec import encode_json
+except ImportError:  # Allows running from api folder.
+    from codec import encode_json
+
+logger = logging.getLogger(__name__)
+
+Handler = Callable[[str | None, str, dict[str, Any]], None]
+CHANNEL = "auction-events"
+
+
+class LocalBus:
+    remote = False
+
+    def __init__(self, deliver: Handler, on_remote: Handler | None = None) -> None:
+        self.deliver = deliver
+
+    def start(self) -> None:
+        pass
+
+    def stop(self) -> None:
+        pass
+
+    def publish(self, auction_id: str | None, event: str, payload: dict[str, Any]) -> None:
+        self.deliver(auction_id, event, payload)
+
+
+class _RemoteBus(ABC):
+    remote = True
+
+    def __init__(self, deliver: Handler, on_remote: Handler | None = None) -> None:
+        self.deliver = deliver
+        self.on_remote = on_remote
+        self.origin = uuid.uuid4().hex
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> None:
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._open()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._close()
+        if self._thread:
+            self._thread.join(timeout=2.0)
+
+    def publish(self, auction_id: str | None, event: str, payload: dict[str, Any]) -> None:
+        # Local sockets are served straight away; other processes get the
+        # event through the bus and skip it on the way back.
+        self.deliver(auction_id, event, payload)
+        message = {"origin": self.origin, "auctionId": auction_id, "event": event, "payload": payload}
+        self._send(encode_json(message).encode())
+
+    def _receive(self, data: bytes) -> None:
+        try:
+            message = json.loads(data)
+        except ValueError:
+            return
+        if not isinstance(message, dict) or message.get("origin") == self.origin:
+            return
+        auction_id, event = message.get("auctionId"), message.get("event")
+        payload = message.get("payload") or {}
+        if self.on_remote is not None:
+            try:
+                self.on_remote(auction_id, event, payload)
+            except Exception:
+                logger.exception("Failed to apply remote %s", event)
+        self.deliver(auction_id, event, payload)
+
+    @abstractmethod
+    def _open(self) -> None:
+        ...
+
+    @abstractmethod
+    def _close(self) -> None:
+        ...
+
+    @abstractmethod
+    def _send(self, data: bytes) -> None:
+        ...
+
+    @abstractmethod
+    def _run(self) -> None:
+        ...
+
+
+class _UnixBroker:
+    def __init__(self, path: str, lock_file: Any) -> None:
+        self.path = path
+        self.lock_file = lock_file
+        self._lock = threading.Lock()
+        self._clients: set[socket.socket] = set()
+        if os.path.exists(path):
+            os.unlink(path)
+        self.server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.server.bind(path)
+        self.server.listen()
+        threading.Thread(target=self._accept, daemon=True).start()
+
+    @classmethod
+    def elect(cls, path: str) -> _UnixBroker | None:
+        # The lock file is released by the OS when its holder exits, so the
+        # next process to reconnect takes over as broker.
+        import fcntl  # Unix only, like the socket itself.
+
+        lock_file = open(f"{path}.lock", "w")
+        try:
+            fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            lock_file.close()
+            return None
+        return cls(path, lock_file)
+
+    def close(self) -> None:
+        self.server.close()
+        with self._lock:
+            clients, self._clients = self._clients, set()
+        for client in clients:
+            client.close()
+        try:
+            os.unlink(self.path)
+        except FileNotFoundError:
+            pass
+        self.lock_file.close()
+
+    def _accept(self) -> None:
+        while True:
+            try:
+                client, _ = self.server.accept()
+            except OSError:
+                return
+            with self._lock:
+                self._clients.add(client)
+            threading.Thread(target=self._forward, args=(client,), daemon=True).start()
+
+    def _forward(self, client: socket.socket) -> None:
+        try:
+            for line in client.makefile("rb"):
+                with self._lock:
+                    peers = [peer for peer in self._clients if peer is not client]
+                for peer in peers:
+                    try:
+                        peer.sendall(line)
+                    except OSError:
+                        self._drop(peer)
+        except OSError:
+            pass
+        self._drop(client)
+
+    def _drop(self, client: socket.socket) -> None:
+        with self._lock:
+            self._clients.discard(client)
+        client.close()
+
+
+class UnixSocketBus(_RemoteBus):
+    def __init__(self, path: str, deliver: Handler, on_remote: Handler | None = None) -> None:
+        super().__init__(deliver, on_remote)
+        self.path = path
+        self._send_lock = threading.Lock()
+        self._socket: socket.socket | None = None
+        self._broker: _UnixBroker | None = None
+
+    def _open(self) -> None:
+        deadline = time.monotonic() + 5.0
+        while True:
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            try:
+                sock.connect(self.path)
+            except (FileNotFoundError, ConnectionRefusedError):
+                sock.close()
+                if self._broker is None:
+                    self._broker = _UnixBroker.elect(self.path)
+                    if self._broker is not None:
+                        continue
+                if time.monotonic() > deadline:
+                    raise
+                time.sleep(0.05)
+                continue
+            with self._send_lock:
+                self._socket = sock
+            return
+
+    def _close(self) -> None:
+        with self._send_lock:
+            sock, self._socket = self._socket, None
+        if sock is not None:
+            try:
+                sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+            sock.close()
+        if self._broker is not None:
+            self._broker.close()
+            self._broker = None
+
+    def _send(self, data: bytes) -> None:
+        with self._send_lock:
+            if self._socket is None:
+                return
+            try:
+                self._socket.sendall(data + b"\n")
+            except OSError:
+                pass
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            with self._send_lock:
+                sock = self._socket
+            if sock is not None:
+                try:
+                    for line in sock.makefile("rb"):
+                        self._receive(line)
+                except OSError:
+                    pass
+            if self._stop.is_set():
+                return
+            # The broker went away; reconnect, electing a new one if needed.
+            with self._send_lock:
+                self._socket = None
+            try:
+                self._open()
+            except OSError:
+                logger.warning("Broadcast broker unavailable at %s", self.path)
+                self._stop.wait(1.0)
+
+
+class MemoryRedis:
+    """In-process stand-in for the Redis pub/sub calls the bus uses."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._subscribers: dict[str, set[_MemoryPubSub]] = {}
+
+    def publish(self, channel: str, data: bytes) -> int:
+        with self._lock:
+            subscribers = list(self._subscribers.get(channel, ()))
+        for subscriber in subscribers:
+            subscriber.messages.put({"type": "message", "channel": channel, "data": data})
+        return len(subscribers)
+
+    def pubsub(self, ignore_subscribe_messages: bool = False) -> _MemoryPubSub:
+        return _MemoryPubSub(self)
+
+
+class _MemoryPubSub:
+    def __init__(self, server: MemoryRedis) -> None:
+        self.server = server
+        self.messages: queue.Queue[dict[str, Any]] = queue.Queue()
+        self.channels: set[str] = set()
+
+    def subscribe(self, *channels: str) -> None:
+        with self.server._lock:
+            for channel in channels:
+                self.server._subscribers.setdefault(channel, set()).add(self)
+                self.channels.add(channel)
+
+    def get_message(self, timeout: float = 0.0) -> dict[str, Any] | None:
+        try:
+            return self.messages.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def close(self) -> None:
+        with self.server._lock:
+            for channel in self.channels:
+                self.server._subscribers.get(channel, set()).discard(self)
+
+
+memory_redis = MemoryRedis()
+
+
+class RedisBus(_RemoteBus):
+    def __init__(
+        self, url: str, deliver: Handler, on_remote: Handler | None = None, channel: str = CHANNEL
+    ) -> None:
+        super().__init__(deliver, on_remote)
+        self.channel = channel
+        if url.startswith("memory://"):
+            self.client = memory_redis
+        else:
+            try:
+                import redis
+            except ImportError as exc:
+                raise RuntimeError("BROADCAST_BUS=redis:// needs the redis package") from exc
+            self.client = redis.Redis.from_url(url)
+        self._pubsub = None
+
+    def _open(self) -> None:
+        self._pubsub = self.client.pubsub(ignore_subscribe_messages=True)
+        self._pubsub.subscribe(self.channel)
+
+    def _close(self) -> None:
+        if self._pubsub is not None:
+            self._pubsub.close()
+
+    def _send(self, data: bytes) -> None:
+        try:
+            self.client.publish(self.channel, data)
+        except Exception:
+            logger.warning("Failed to publish to %s", self.channel)
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                message = self._pubsub.get_message(timeout=1.0)
+            except Exception:
+                logger.warning("Lost subscription to %s", self.channel)
+                self._stop.wait(1.0)
+                try:
+                    self._open()
+                except Exception:
+                    pass
+                continue
+            if message and message.get("type") == "message":
+                self._receive(message["data"])
+
+
+def create_bus(url: str, deliver: Handler, on_remote: Handler | None = None):
+    if not url or url == "local":
+        return LocalBus(deliver, on_remote)
+    if url.startswith("unix://"):
+        return UnixSocketBus(url[len("unix://"):], deliver, on_remote)
+    if url.startswith(("redis://", "rediss://", "memory://")):
+        return RedisBus(url, deliver, on_remote)
+    raise ValueError(f"Unsupported BROADCAST_BUS: {url}")
@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+import json
+import math
+import struct
+from typing import Any
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to the stdlib encoder.
+    orjson = None
+
+
+def encode_json(message: dict[str, Any]) -> str:
+    if orjson is not None:
+        return orjson.dumps(message).decode()
+    return json.dumps(message, ensure_ascii=False, separators=(",", ":"))
+
+
+# Fixed little-endian layouts for the high-frequency events sent to clients
+# that connect with ?proto=binary. Strings are sent as interned refs.
+TIMER_SYNC = struct.Struct("<BIfBd")  # kind, auction, timeLeft, isRunning, endsAt (NaN = paused)
+BID_UPDATE = struct.Struct("<BIIIII")  # kind, auction, team, team name, currentBid, version
+TIMER_SYNC_KIND = 1
+BID_UPDATE_KIND = 2
+
+
+class Interner:
+    def __init__(self) -> None:
+        self._refs: dict[str, int] = {}
+
+    def ref(self, value: str) -> int:
+        ref = self._refs.get(value)
+        if ref is None:
+            ref = self._refs[value] = len(self._refs) + 1
+        return ref
+
+
+def encode_binary(
+    message: dict[str, Any], interner: Interner
+) -> tuple[bytes, dict[int, str]] | None:
+    event = message.get("event")
+    payload = message.get("payload") or {}
+    if event == "timer_sync":
+        strings = [payload["auctionId"]]
+        refs = [interner.ref(value) for value in strings]
+        ends_at = payload.get("endsAt")
+        data = TIMER_SYNC.pack(
+            TIMER_SYNC_KIND,
+            refs[0],
+            payload["timeLeft"],
+            bool(payload["isRunning"]),
+            math.nan if ends_at is None else ends_at,
+        )
+    elif event == "bid_update":
+        strings = [payload["auctionId"], payload["highBidder"], payload["highBidderName"]]
+        refs = [interner.ref(value) for value in strings]
+        data = BID_UPDATE.pack(
+            BID_UPDATE_KIND, *refs, payload["currentBid"], payload.get("version") or 0
+        )
+    else:
+        return None
+    return data, dict(zip(refs, strings))
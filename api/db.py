@@ -1,7 +1,9 @@
 from __future__ import annotations
 
 import os
-from sqlalchemy import create_engine
+from sqlalchemy import Insert, create_engine, event
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.engine import URL, Engine, make_url
 from sqlalchemy.orm import DeclarativeBase, sessionmaker
 
 
@@ -9,19 +11,62 @@ class Base(DeclarativeBase):
     pass
 
 
+# Defaults for SQLite connections; each one can be overridden with a query
+# option on DATABASE_URL, e.g. sqlite:///./auction.db?synchronous=FULL&mmap_size=0
+SQLITE_PRAGMAS = {
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    "busy_timeout": "5000",
+    "cache_size": "-65536",
+    "mmap_size": "268435456",
+    "temp_store": "MEMORY",
+}
+
+
 def _get_database_url() -> str:
     return os.getenv("DATABASE_URL", "sqlite:///./auction.db")
 
 
-def _build_engine():
-    url = _get_database_url()
-    if url.startswith("sqlite"):
-        return create_engine(url, connect_args={"check_same_thread": False})
-    return create_engine(url)
+def _sqlite_pragmas(url: URL) -> tuple[URL, dict[str, str]]:
+    pragmas = {key: url.query.get(key, value) for key, value in SQLITE_PRAGMAS.items()}
+    return url.difference_update_query(SQLITE_PRAGMAS), pragmas
+
+
+def _is_memory(url: URL) -> bool:
+    return url.database in (None, "", ":memory:")
+
+
+def _build_engine(**pool_args) -> Engine:
+    url = make_url(_get_database_url())
+    if url.get_backend_name() != "sqlite":
+        return create_engine(url, **pool_args)
+    url, pragmas = _sqlite_pragmas(url)
+    if _is_memory(url):
+        pool_args = {}
+    engine = create_engine(url, connect_args={"check_same_thread": False}, **pool_args)
+
+    @event.listens_for(engine, "connect")
+    def _set_pragmas(dbapi_connection, _connection_record) -> None:
+        cursor = dbapi_connection.cursor()
+        for key, value in pragmas.items():
+            cursor.execute(f"PRAGMA {key}={value}")
+        cursor.close()
+
+    return engine
 
 
 engine = _build_engine()
+# Write-behind flushes go through one dedicated connection so batched bid
+# writes are serialized instead of competing for the SQLite write lock.
+write_engine = engine if _is_memory(engine.url) else _build_engine(pool_size=1, max_overflow=0)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+WriterSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=write_engine)
+
+
+def insert_or_ignore(model: type[Base], *index_elements: str) -> Insert:
+    # INSERT ... ON CONFLICT DO NOTHING against the given unique index.
+    dialect = postgresql if engine.dialect.name == "postgresql" else sqlite
+    return dialect.insert(model).on_conflict_do_nothing(index_elements=list(index_elements))
 
 
 def get_db():
@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+from typing import Any, Callable
+
+PRIORITY_EVENTS = {"bid_update", "round_end", "new_round", "game_started", "point_change"}
+GLOBAL_KEY = "_global"
+
+
+class BroadcastDispatcher:
+    def __init__(self, deliver: Callable[[str | None, dict[str, Any]], None]) -> None:
+        self.deliver = deliver
+        self._lanes: dict[str, tuple[deque, deque]] = {}
+        self._workers: dict[str, asyncio.Task] = {}
+        self._loop: asyncio.AbstractEventLoop | None = None
+
+    def bind(self, loop: asyncio.AbstractEventLoop) -> None:
+        self._loop = loop
+
+    def publish(self, auction_id: str | None, event: str, payload: dict) -> None:
+        if self._loop is None or self._loop.is_closed():
+            return
+        message = {"event": event, "payload": payload}
+        self._loop.call_soon_threadsafe(self._enqueue, auction_id or GLOBAL_KEY, message)
+
+    def depth(self) -> dict[str, dict[str, int]]:
+        return {
+            key: {"priority": len(high), "normal": len(low)}
+            for key, (high, low) in list(self._lanes.items())
+        }
+
+    def _enqueue(self, key: str, message: dict[str, Any]) -> None:
+        high, low = self._lanes.setdefault(key, (deque(), deque()))
+        if message["event"] in PRIORITY_EVENTS:
+            high.append(message)
+        else:
+            low.append(message)
+        worker = self._workers.get(key)
+        if worker is None or worker.done():
+            self._workers[key] = asyncio.create_task(self._run(key))
+
+    async def _run(self, key: str) -> None:
+        high, low = self._lanes[key]
+        target = None if key == GLOBAL_KEY else key
+        try:
+            while high or low:
+                message = high.popleft() if high else low.popleft()
+                try:
+                    self.deliver(target, message)
+                except Exception:
+                    pass
+                await asyncio.sleep(0)
+        finally:
+            if self._workers.get(key) is asyncio.current_task():
+                self._workers.pop(key, None)
+                if not high and not low:
+                    self._lanes.pop(key, None)
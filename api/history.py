@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+import threading
+from collections import deque
+from typing import Callable
+
+HISTORY_SIZE = 50
+
+
+class LogHistory:
+    def __init__(self, loader: Callable[[str, int], list[str]], size: int = HISTORY_SIZE) -> None:
+        self.loader = loader
+        self.size = size
+        self._lock = threading.Lock()
+        self._buffers: dict[str, deque[str]] = {}
+        self._revisions: dict[str, int] = {}
+        self._loading: dict[str, threading.Lock] = {}
+
+    def revision(self, auction_id: str) -> int:
+        with self._lock:
+            return self._revisions.get(auction_id, 0)
+
+    def loaded(self, auction_id: str) -> bool:
+        with self._lock:
+            return auction_id in self._buffers
+
+    def recent(self, auction_id: str) -> list[str]:
+        with self._lock:
+            buffer = self._buffers.get(auction_id)
+            if buffer is not None:
+                return list(buffer)
+            loading = self._loading.setdefault(auction_id, threading.Lock())
+        # The loader may wait on the database, so it runs outside the shared
+        # lock; the per-auction lock keeps concurrent readers from loading twice.
+        with loading:
+            with self._lock:
+                buffer = self._buffers.get(auction_id)
+                if buffer is not None:
+                    return list(buffer)
+                revision = self._revisions.get(auction_id, 0)
+            messages = list(self.loader(auction_id, self.size))
+            with self._lock:
+                # A message appended during the load may be missing from it.
+                if self._revisions.get(auction_id, 0) == revision:
+                    self._buffers[auction_id] = deque(messages, maxlen=self.size)
+            return messages
+
+    def append(self, auction_id: str, message: str) -> None:
+        with self._lock:
+            self._revisions[auction_id] = self._revisions.get(auction_id, 0) + 1
+            buffer = self._buffers.get(auction_id)
+            if buffer is not None:
+                buffer.appendleft(message)
+
+    def invalidate(self, auction_id: str) -> None:
+        with self._lock:
+            self._revisions[auction_id] = self._revisions.get(auction_id, 0) + 1
+            self._buffers.pop(auction_id, None)
@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+import codecs
+import csv
+from typing import Callable, Iterable, Iterator
+
+from pydantic import ValidationError
+
+try:
+    from .schemas import PlayerCreate, PlayerImportError
+    from .tiers import parse_players
+except ImportError:  # Allows running from api folder.
+    from schemas import PlayerCreate, PlayerImportError
+    from tiers import parse_players
+
+IMPORT_FORMATS = ("ndjson", "csv", "log")
+MAX_REPORTED_ERRORS = 100
+
+Reader = Callable[[Iterable[str], list[PlayerImportError]], Iterator[PlayerCreate]]
+
+
+def import_format(content_type: str | None) -> str:
+    media_type = (content_type or "").split(";", 1)[0].strip().lower()
+    if media_type in {"application/x-ndjson", "application/jsonl", "application/json-seq"}:
+        return "ndjson"
+    if media_type == "text/csv":
+        return "csv"
+    return "log"
+
+
+def iter_lines(chunks: Iterable[bytes]) -> Iterator[str]:
+    # Decodes as bytes arrive; a character or line split across chunks is
+    # held back until the rest of it shows up.
+    decoder = codecs.getincrementaldecoder("utf-8-sig")(errors="replace")
+    buffer = ""
+    for chunk in chunks:
+        buffer += decoder.decode(chunk)
+        lines = buffer.splitlines(keepends=True)
+        buffer = lines.pop() if lines and not lines[-1].endswith(("\n", "\r")) else ""
+        yield from lines
+    buffer += decoder.decode(b"", final=True)
+    if buffer:
+        yield buffer
+
+
+def _report(errors: list[PlayerImportError], line: int, detail: str) -> None:
+    if len(errors) < MAX_REPORTED_ERRORS:
+        errors.append(PlayerImportError(line=line, detail=detail))
+
+
+def read_ndjson(lines: Iterable[str], errors: list[PlayerImportError]) -> Iterator[PlayerCreate]:
+    for number, line in enumerate(lines, start=1):
+        if not line.strip():
+            continue
+        try:
+            yield PlayerCreate.model_validate_json(line)
+        except ValidationError as exc:
+            _report(errors, number, exc.errors()[0]["msg"])
+
+
+def read_csv(lines: Iterable[str], errors: list[PlayerImportError]) -> Iterator[PlayerCreate]:
+    reader = csv.DictReader(lines)
+    for row in reader:
+        # DictReader puts cells beyond the header in a list under None.
+        if None in row:
+            _report(errors, reader.line_num, "More cells than header columns")
+            continue
+        values = {key.strip().lower(): (value or "").strip() for key, value in row.items()}
+        if not values.get("name"):
+            _report(errors, reader.line_num, "Missing name")
+            continue
+        yield PlayerCreate(
+            id=values.get("id") or None,
+            name=values["name"],
+            tiers={
+                "tank": values.get("tank") or "N/A",
+                "dps": values.get("dps") or "N/A",
+                "supp": values.get("supp") or "N/A",
+            },
+        )
+
+
+def read_log(lines: Iterable[str], errors: list[PlayerImportError]) -> Iterator[PlayerCreate]:
+    for name, (tank, dps, supp) in parse_players(lines):
+        yield PlayerCreate(name=name, tiers={"tank": tank, "dps": dps, "supp": supp})
+
+
+READERS: dict[str, Reader] = {"ndjson": read_ndjson, "csv": read_csv, "log": read_log}
@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+import threading
+import uuid
+from datetime import datetime, timedelta
+from typing import Callable
+
+from sqlalchemy import delete, or_, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+try:
+    from .models import TimerLease
+except ImportError:  # Allows running from api folder.
+    from models import TimerLease
+
+
+class TimerLeases:
+    def __init__(self, session_factory: Callable[[], Session], ttl: float) -> None:
+        self.session_factory = session_factory
+        self.ttl = timedelta(seconds=ttl)
+        self.owner = uuid.uuid4().hex
+        self._lock = threading.Lock()
+        self._held: dict[str, datetime] = {}
+
+    def owns(self, auction_id: str) -> bool:
+        with self._lock:
+            expires_at = self._held.get(auction_id)
+        return expires_at is not None and expires_at > datetime.utcnow()
+
+    def claim(self, auction_id: str) -> bool:
+        # Takes the lease when it is free or expired, and renews it when it
+        # is already ours; another live owner keeps it.
+        now = datetime.utcnow()
+        expires_at = now + self.ttl
+        db = self.session_factory()
+        try:
+            result = db.execute(
+                update(TimerLease)
+                .where(
+                    TimerLease.auction_id == auction_id,
+                    or_(TimerLease.owner == self.owner, TimerLease.expires_at <= now),
+                )
+                .values(owner=self.owner, expires_at=expires_at)
+            )
+            claimed = result.rowcount > 0
+            if not claimed:
+                db.add(TimerLease(auction_id=auction_id, owner=self.owner, expires_at=expires_at))
+                try:
+                    db.flush()
+                    claimed = True
+                except IntegrityError:
+                    db.rollback()
+            db.commit()
+        finally:
+            db.close()
+        with self._lock:
+            if claimed:
+                self._held[auction_id] = expires_at
+            else:
+                self._held.pop(auction_id, None)
+        return claimed
+
+    def release_all(self) -> None:
+        with self._lock:
+            held, self._held = list(self._held), {}
+        if not held:
+            return
+        db = self.session_factory()
+        try:
+            db.execute(
+                delete(TimerLease).where(
+                    TimerLease.auction_id.in_(held), TimerLease.owner == self.owner
+                )
+            )
+            db.commit()
+        finally:
+            db.close()
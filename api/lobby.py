@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+import threading
+from contextlib import contextmanager
+from typing import Callable, Iterator
+
+from sqlalchemy import select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+try:
+    from .models import LobbyVersion
+except ImportError:  # Allows running from api folder.
+    from models import LobbyVersion
+
+
+class LobbyVersions:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._versions: dict[str, int] = {}
+        self._issuing: dict[str, threading.RLock] = {}
+
+    def current(self, auction_id: str) -> int:
+        with self._lock:
+            return self._versions.get(auction_id, 0)
+
+    def observe(self, auction_id: str, version: int) -> None:
+        with self._lock:
+            if version > self._versions.get(auction_id, 0):
+                self._versions[auction_id] = version
+
+    @contextmanager
+    def next_version(self, auction_id: str) -> Iterator[int]:
+        # Held per auction while the change is published so versions reach
+        # the dispatcher in the same order they were issued; build the
+        # payload before entering.
+        with self._lock:
+            issuing = self._issuing.setdefault(auction_id, threading.RLock())
+        with issuing:
+            with self._lock:
+                version = self._versions.get(auction_id, 0) + 1
+                self._versions[auction_id] = version
+            yield version
+
+
+class SharedLobbyVersions(LobbyVersions):
+    def __init__(self, session_factory: Callable[[], Session]) -> None:
+        super().__init__()
+        self.session_factory = session_factory
+
+    @contextmanager
+    def next_version(self, auction_id: str) -> Iterator[int]:
+        # Versions come from one row per auction, shared by every process.
+        # Its lock is held until the change is published, so a snapshot read
+        # under a higher version never predates one read under a lower one.
+        db = self.session_factory()
+        try:
+            version = self._increment(db, auction_id)
+            self.observe(auction_id, version)
+            yield version
+            db.commit()
+        finally:
+            db.close()
+
+    def _increment(self, db: Session, auction_id: str) -> int:
+        while True:
+            result = db.execute(
+                update(LobbyVersion)
+                .where(LobbyVersion.auction_id == auction_id)
+                .values(version=LobbyVersion.version + 1)
+            )
+            if result.rowcount:
+                return db.scalar(
+                    select(LobbyVersion.version).where(LobbyVersion.auction_id == auction_id)
+                )
+            version = self.current(auction_id) + 1
+            db.add(LobbyVersion(auction_id=auction_id, version=version))
+            try:
+                db.flush()
+            except IntegrityError:
+                db.rollback()
+                continue
+            return version
+
+
+def player_upsert(player: dict) -> dict:
+    return {"op": "player_upsert", "player": player}
+
+
+def player_remove(player_id: str) -> dict:
+    return {"op": "player_remove", "playerId": player_id}
+
+
+def team_upsert(team: dict) -> dict:
+    return {"op": "team_upsert", "team": team}
+
+
+def team_remove(team_id: str) -> dict:
+    return {"op": "team_remove", "teamId": team_id}
+
+
+def team_points(team_id: str, points: int) -> dict:
+    return {"op": "team_points", "teamId": team_id, "points": points}
@@ -1,24 +1,53 @@
 from __future__ import annotations
 
 import asyncio
+import json
+import logging
 import os
 import random
-import re
 import time
 import uuid
-import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import Iterable
-
-from fastapi import Depends, FastAPI, Header, HTTPException, WebSocket, WebSocketDisconnect, status
+from functools import partial
+from typing import Callable, Iterable, Iterator, Literal, TypeVar
+
+import anyio
+
+from fastapi import (
+    Depends,
+    FastAPI,
+    Header,
+    HTTPException,
+    Query,
+    Request,
+    WebSocket,
+    WebSocketDisconnect,
+    status,
+)
 from fastapi.middleware.cors import CORSMiddleware
 from dotenv import load_dotenv, dotenv_values
-from sqlalchemy import select
+from sqlalchemy import delete, func, select, update
+from sqlalchemy.exc import IntegrityError
+from pydantic import ValidationError
 from sqlalchemy.orm import Session
 
 try:
-    from .db import Base, SessionLocal, engine, get_db
-    from .models import AdminSession, Auction, BidLog, GameState, Player, Team
+    from .auth import AdminSessions
+    from .bus import create_bus
+    from .codec import encode_json
+    from .db import SessionLocal, WriterSessionLocal, engine, get_db, insert_or_ignore
+    from .migrations import migrate
+    from .models import Auction, BidLog, GameState, Player, Team, player_dedupe_key
+    from .runtime import (
+        AuctionRuntime,
+        BidRejected,
+        DraftQueue,
+        RuntimeRegistry,
+        TeamSeat,
+        WriteBehind,
+    )
+    from .snapshots import SnapshotCache
     from .schemas import (
         AuctionCreateRequest,
         AuctionCreateResponse,
@@ -31,6 +60,8 @@ try:
         JoinLobbyRequest,
         ParseLogRequest,
         PlayerCreate,
+        PlayerImportError,
+        PlayerImportResult,
         PlayerOut,
         PlayerUpdate,
         StartGameRequest,
@@ -42,10 +73,39 @@ try:
         AdminLoginResponse,
         InviteValidateResponse,
     )
+    from .dispatch import BroadcastDispatcher
+    from .history import LogHistory
+    from .imports import IMPORT_FORMATS, READERS, import_format, iter_lines
+    from .leases import TimerLeases
+    from .lobby import (
+        LobbyVersions,
+        SharedLobbyVersions,
+        player_remove,
+        player_upsert,
+        team_points,
+        team_remove,
+        team_upsert,
+    )
+    from .ranking import TIER_ORDERS, RatingTable, player_ratings
+    from .tiers import parse_players
+    from .timer import TimerScheduler
     from .ws import ConnectionManager
 except ImportError:  # Allows running "uvicorn main:app" from the api folder.
-    from db import Base, SessionLocal, engine, get_db
-    from models import AdminSession, Auction, BidLog, GameState, Player, Team
+    from auth import AdminSessions
+    from bus import create_bus
+    from codec import encode_json
+    from db import SessionLocal, WriterSessionLocal, engine, get_db, insert_or_ignore
+    from migrations import migrate
+    from models import Auction, BidLog, GameState, Player, Team, player_dedupe_key
+    from runtime import (
+        AuctionRuntime,
+        BidRejected,
+        DraftQueue,
+        RuntimeRegistry,
+        TeamSeat,
+        WriteBehind,
+    )
+    from snapshots import SnapshotCache
     from schemas import (
         AuctionCreateRequest,
         AuctionCreateResponse,
@@ -58,6 +118,8 @@ except ImportError:  # Allows running "uvicorn main:app" from the api folder.
         JoinLobbyRequest,
         ParseLogRequest,
         PlayerCreate,
+        PlayerImportError,
+        PlayerImportResult,
         PlayerOut,
         PlayerUpdate,
         StartGameRequest,
@@ -69,23 +131,53 @@ except ImportError:  # Allows running "uvicorn main:app" from the api folder.
         AdminLoginResponse,
         InviteValidateResponse,
     )
+    from dispatch import BroadcastDispatcher
+    from history import LogHistory
+    from imports import IMPORT_FORMATS, READERS, import_format, iter_lines
+    from leases import TimerLeases
+    from lobby import (
+        LobbyVersions,
+        SharedLobbyVersions,
+        player_remove,
+        player_upsert,
+        team_points,
+        team_remove,
+        team_upsert,
+    )
+    from ranking import TIER_ORDERS, RatingTable, player_ratings
+    from tiers import parse_players
+    from timer import TimerScheduler
     from ws import ConnectionManager
  
 load_dotenv(".env", override=True)
 
+logger = logging.getLogger(__name__)
+
 DEFAULT_TIMER = 20.0
+IMPORT_CHUNK_SIZE = 500
 MAX_TIMER = 20.0
 BONUS_TIME_ON_BID = 2.0
+TIMER_SYNC_INTERVAL = float(os.getenv("TIMER_SYNC_INTERVAL", "0"))
+WS_SEND_QUEUE_SIZE = int(os.getenv("WS_SEND_QUEUE_SIZE", "256"))
+WS_MAX_LAG_SECONDS = float(os.getenv("WS_MAX_LAG_SECONDS", "5.0"))
+WS_VIEWER_INTERVAL = float(os.getenv("WS_VIEWER_INTERVAL", "0.25"))
+BROADCAST_BUS = os.getenv("BROADCAST_BUS", "")
+TIMER_LEASE_TTL = float(os.getenv("TIMER_LEASE_TTL", "30"))
+WRITE_BEHIND_INTERVAL = float(os.getenv("WRITE_BEHIND_INTERVAL", "0.05"))
+AUTO_HAMMER = os.getenv("AUTO_HAMMER", "0").lower() in {"1", "true"}
+THREADPOOL_SIZE = int(os.getenv("THREADPOOL_SIZE", "100"))
+ADMIN_SESSION_TTL = float(os.getenv("ADMIN_SESSION_TTL", "43200"))
+ADMIN_SESSION_RECHECK = float(os.getenv("ADMIN_SESSION_RECHECK", "5"))
 ADMIN_ID = os.getenv("ADMIN_ID", "admin")
 ADMIN_PW = os.getenv("ADMIN_PW", "admin")
 INVITE_BASE_URL = os.getenv("INVITE_BASE_URL", "http://localhost:5173/#/join?invite=")
 
 app = FastAPI(title="CHZZK Auction API", version="0.1.0")
-manager = ConnectionManager()
-timer_lock = threading.Lock()
-timer_stop_event = threading.Event()
-timer_thread: threading.Thread | None = None
-app.state.broadcast_queue = None
+manager = ConnectionManager(
+    max_queue=WS_SEND_QUEUE_SIZE,
+    max_lag=WS_MAX_LAG_SECONDS,
+    viewer_interval=WS_VIEWER_INTERVAL,
+)
 
 app.add_middleware(
     CORSMiddleware,
@@ -109,12 +201,14 @@ def _ensure_game_state(db: Session, auction_id: str) -> GameState:
     return state
 
 
+admin_sessions = AdminSessions(ttl=ADMIN_SESSION_TTL, recheck=ADMIN_SESSION_RECHECK)
+
+
 def _require_admin(db: Session, authorization: str | None) -> None:
     if not authorization or not authorization.startswith("Bearer "):
         raise HTTPException(status_code=401, detail="Missing admin token")
     token = authorization.replace("Bearer ", "", 1).strip()
-    session = db.get(AdminSession, token)
-    if not session:
+    if not admin_sessions.verify(db, token):
         raise HTTPException(status_code=401, detail="Invalid admin token")
 
 
@@ -124,53 +218,72 @@ def _require_auction_id(auction_id: str | None) -> str:
     return auction_id
 
 
-def _timer_loop() -> None:
-    tick = 0.05
-    last_time = time.monotonic()
-    while not timer_stop_event.is_set():
-        time.sleep(tick)
-        now = time.monotonic()
-        elapsed = now - last_time
-        last_time = now
-        db = SessionLocal()
-        try:
-            running_states = db.scalars(
-                select(GameState).where(GameState.is_timer_running.is_(True))
-            ).all()
-            if not running_states:
-                timer_stop_event.set()
-                break
-            for state in running_states:
-                next_value = max(0.0, state.timer_value - elapsed)
-                state.timer_value = next_value
-                if next_value <= 0:
-                    state.is_timer_running = False
-                _broadcast(
-                    "timer_sync",
-                    {
-                        "auctionId": state.auction_id,
-                        "timeLeft": state.timer_value,
-                        "isRunning": state.is_timer_running,
-                    },
-                )
-            db.commit()
-        finally:
-            db.close()
+def _ends_at(time_left: float, is_running: bool) -> float | None:
+    return time.time() + time_left if is_running else None
+
+
+def _timer_payload(auction_id: str, time_left: float, is_running: bool) -> dict:
+    return {
+        "auctionId": auction_id,
+        "timeLeft": time_left,
+        "isRunning": is_running,
+        "endsAt": _ends_at(time_left, is_running),
+        "serverTime": time.time(),
+    }
 
 
-def _start_timer_thread() -> None:
-    global timer_thread
-    with timer_lock:
-        if timer_thread and timer_thread.is_alive():
-            return
-        timer_stop_event.clear()
-        timer_thread = threading.Thread(target=_timer_loop, daemon=True)
-        timer_thread.start()
+def _claim_timer(auction_id: str) -> bool:
+    return leases is None or leases.claim(auction_id)
+
+
+def _on_timer_tick(auction_id: str, time_left: float, is_running: bool) -> None:
+    if leases is None or leases.owns(auction_id):
+        _broadcast("timer_sync", _timer_payload(auction_id, time_left, is_running))
+
+
+def _on_timer_expire(auction_id: str) -> None:
+    # Every process follows the clock, but only the lease holder acts on it.
+    if not _claim_timer(auction_id):
+        return
+    with runtimes.lock(auction_id):
+        runtime = runtimes.get(auction_id)
+        # An admin may have restarted or paused the clock while we waited
+        # for the lock; only settle a round whose timer really ran out.
+        if (
+            runtime.auto_hammer
+            and runtime.current_player is not None
+            and timers.snapshot(auction_id) == (0.0, False)
+        ):
+            try:
+                _settle_round(auction_id, "sold" if runtime.high_bidder_id else "pass")
+                return
+            except HTTPException as exc:
+                # e.g. the high bidder's team was deleted mid-round; leave the
+                # round for the admin to settle, as without auto-hammer.
+                logger.warning("Auto hammer failed for auction %s: %s", auction_id, exc.detail)
+        writer.record(auction_id, {"timer_value": 0.0, "is_timer_running": False})
+    _broadcast("timer_sync", _timer_payload(auction_id, 0.0, False))
+
+
+timers = TimerScheduler(_on_timer_tick, _on_timer_expire, sync_interval=TIMER_SYNC_INTERVAL)
+
+
+def _timer_values(state: GameState | AuctionRuntime) -> tuple[float, bool]:
+    snapshot = timers.snapshot(state.auction_id)
+    if snapshot is None:
+        return state.timer_value, state.is_timer_running
+    return snapshot
+
+
+def _sync_timer_state(state: GameState) -> None:
+    state.timer_value, state.is_timer_running = _timer_values(state)
 
 
 def _log(db: Session, auction_id: str, message: str) -> None:
+    writer.flush(auction_id)
     db.add(BidLog(auction_id=auction_id, message=message))
     db.commit()
+    history.append(auction_id, message)
 
 
 def _players_out(players: Iterable[Player]) -> list[dict]:
@@ -181,19 +294,23 @@ def _teams_out(teams: Iterable[Team]) -> list[dict]:
     return [_team_to_out(team).model_dump(by_alias=True) for team in teams]
 
 
+def _deliver(auction_id: str | None, message: dict) -> None:
+    if auction_id:
+        manager.broadcast_to(auction_id, message)
+    else:
+        manager.broadcast(message)
+
+
+dispatcher = BroadcastDispatcher(_deliver)
+
+
 def _broadcast(event: str, payload: dict, auction_id: str | None = None) -> None:
-    if not manager.active_connections:
-        return
-    queue: asyncio.Queue | None = app.state.broadcast_queue
-    loop: asyncio.AbstractEventLoop | None = app.state.loop
-    if queue is None or loop is None:
+    if not bus.remote and not manager.connection_index:
         return
     target = auction_id
     if target is None and isinstance(payload, dict):
         target = payload.get("auctionId")
-    asyncio.run_coroutine_threadsafe(
-        queue.put({"event": event, "payload": payload, "auction_id": target}), loop
-    )
+    bus.publish(target, event, payload)
 
 
 def _broadcast_for_auction(auction_id: str, event: str, payload: dict) -> None:
@@ -201,6 +318,37 @@ def _broadcast_for_auction(auction_id: str, event: str, payload: dict) -> None:
     _broadcast(event, data, auction_id=auction_id)
 
 
+def _broadcast_lobby(db: Session, auction_id: str) -> None:
+    writer.flush(auction_id)
+    if bus.remote:
+        # The shared version row stays locked while the snapshot is read, so
+        # a higher version never carries an older snapshot from another process.
+        with lobby_versions.next_version(auction_id) as version:
+            _broadcast("lobby_update", _lobby_payload(db, auction_id, version))
+        return
+    payload = _lobby_payload(db, auction_id)
+    with lobby_versions.next_version(auction_id) as version:
+        _broadcast("lobby_update", {**payload, "version": version})
+
+
+def _broadcast_lobby_patch(auction_id: str, ops: list[dict]) -> None:
+    if not ops:
+        return
+    if bus.remote:
+        # Patches from different processes can cross on the bus; a full
+        # snapshot under a shared version cannot be applied out of order.
+        db = SessionLocal()
+        try:
+            _broadcast_lobby(db, auction_id)
+        finally:
+            db.close()
+        return
+    with lobby_versions.next_version(auction_id) as version:
+        _broadcast(
+            "lobby_patch", {"auctionId": auction_id, "version": version, "ops": ops}
+        )
+
+
 def _player_to_out(player: Player) -> PlayerOut:
     return PlayerOut(
         id=player.id,
@@ -230,6 +378,14 @@ def _team_to_out(team: Team) -> TeamOut:
     )
 
 
+def _player_patch(player: Player) -> dict:
+    return player_upsert(_player_to_out(player).model_dump(by_alias=True))
+
+
+def _team_patch(team: Team) -> dict:
+    return team_upsert(_team_to_out(team).model_dump(by_alias=True, exclude={"roster"}))
+
+
 def _team_to_slim(team: Team | None) -> TeamSlim | None:
     if not team:
         return None
@@ -239,74 +395,218 @@ def _team_to_slim(team: Team | None) -> TeamSlim | None:
 def _state_to_out(state: GameState, bid_history: list[str]) -> GameStateOut:
     current_player = _player_to_out(state.current_player) if state.current_player else None
     high_bidder = _team_to_slim(state.high_bidder)
+    timer_value, is_timer_running = _timer_values(state)
     return GameStateOut(
         phase=state.phase,
         auction_id=state.auction_id,
         current_player=current_player,
         current_bid=state.current_bid,
         high_bidder=high_bidder,
-        timer_value=state.timer_value,
-        is_timer_running=state.is_timer_running,
+        timer_value=timer_value,
+        is_timer_running=is_timer_running,
+        ends_at=_ends_at(timer_value, is_timer_running),
         bid_history=bid_history,
+        auto_hammer=state.auto_hammer,
+        version=state.version,
     )
 
 
-def _state_payload(db: Session, auction_id: str) -> dict:
-    state = _ensure_game_state(db, auction_id)
-    logs = db.scalars(
-        select(BidLog)
-        .where(BidLog.auction_id == auction_id)
-        .order_by(BidLog.id.desc())
-        .limit(50)
-    ).all()
-    history = [log.message for log in logs]
-    return _state_to_out(state, history).model_dump(by_alias=True)
+def _runtime_to_out(runtime: AuctionRuntime) -> GameStateOut:
+    high_bidder = runtime.teams.get(runtime.high_bidder_id or "")
+    timer_value, is_timer_running = _timer_values(runtime)
+    return GameStateOut(
+        phase=runtime.phase,
+        auction_id=runtime.auction_id,
+        current_player=runtime.current_player,
+        current_bid=runtime.current_bid,
+        high_bidder=TeamSlim(id=high_bidder.id, name=high_bidder.name) if high_bidder else None,
+        timer_value=timer_value,
+        is_timer_running=is_timer_running,
+        ends_at=_ends_at(timer_value, is_timer_running),
+        bid_history=history.recent(runtime.auction_id),
+        auto_hammer=runtime.auto_hammer,
+        version=runtime.version,
+    )
 
 
-def _normalize_player_field(value: str | None) -> str:
-    return (value or "").strip().lower()
+def _load_draft(db: Session, auction_id: str, current_id: str | None) -> DraftQueue:
+    players = db.scalars(select(Player).where(Player.auction_id == auction_id)).all()
+    return DraftQueue.build(
+        (_player_to_out(player).model_dump(by_alias=True) for player in players), current_id
+    )
 
 
-def _player_key(name: str, tank: str, dps: str, supp: str) -> tuple[str, str, str, str]:
-    return (
-        _normalize_player_field(name),
-        _normalize_player_field(tank),
-        _normalize_player_field(dps),
-        _normalize_player_field(supp),
-    )
+def _load_runtime(auction_id: str, draft: DraftQueue | None) -> AuctionRuntime:
+    db = SessionLocal()
+    try:
+        state = _ensure_game_state(db, auction_id)
+        teams = db.execute(
+            select(Team.id, Team.name, Team.points).where(Team.auction_id == auction_id)
+        ).all()
+        if draft is None:
+            draft = _load_draft(db, auction_id, state.current_player_id)
+        roster_counts = draft.roster_counts()
+        runtime = AuctionRuntime(
+            auction_id=auction_id,
+            phase=state.phase,
+            current_player=draft.players.get(state.current_player_id or ""),
+            current_bid=state.current_bid,
+            high_bidder_id=state.high_bidder_id,
+            last_bid_team_id=state.last_bid_team_id,
+            timer_value=state.timer_value,
+            is_timer_running=state.is_timer_running,
+            version=state.version,
+            teams={
+                team.id: TeamSeat(
+                    id=team.id,
+                    name=team.name,
+                    points=team.points,
+                    roster_count=roster_counts.get(team.id, 0),
+                )
+                for team in teams
+            },
+            draft=draft,
+            auto_hammer=state.auto_hammer,
+        )
+        return runtime
+    finally:
+        db.close()
+
+
+def _load_history(auction_id: str, limit: int) -> list[str]:
+    writer.flush(auction_id)
+    db = SessionLocal()
+    try:
+        return list(
+            db.scalars(
+                select(BidLog.message)
+                .where(BidLog.auction_id == auction_id)
+                .order_by(BidLog.id.desc())
+                .limit(limit)
+            ).all()
+        )
+    finally:
+        db.close()
+
+
+writer = WriteBehind(WriterSessionLocal, interval=WRITE_BEHIND_INTERVAL)
+runtimes = RuntimeRegistry(_load_runtime, writer)
+history = LogHistory(_load_history)
+
+REMOTE_STATE_EVENTS = {"bid_update", "round_end", "new_round", "state_sync"}
 
 
-def _lobby_payload(db: Session, auction_id: str) -> dict:
+def _on_remote_event(auction_id: str | None, event: str, payload: dict) -> None:
+    # Another process changed this auction: follow its clock and drop the
+    # local copies so the next read comes from the database it flushed to.
+    if auction_id is None:
+        return
+    if event == "timer_sync":
+        is_running = bool(payload.get("isRunning"))
+        ends_at = payload.get("endsAt")
+        if is_running and ends_at is not None:
+            time_left = max(0.0, ends_at - time.time())
+        else:
+            time_left = float(payload.get("timeLeft") or 0.0)
+        timers.mirror(auction_id, time_left, is_running)
+    elif event in {"lobby_update", "lobby_patch"}:
+        lobby_versions.observe(auction_id, payload.get("version") or 0)
+        runtimes.invalidate(auction_id, draft=True)
+    elif event in REMOTE_STATE_EVENTS:
+        runtimes.invalidate(auction_id, draft=event != "bid_update")
+        history.invalidate(auction_id)
+
+
+bus = create_bus(BROADCAST_BUS, dispatcher.publish, _on_remote_event)
+leases = TimerLeases(SessionLocal, TIMER_LEASE_TTL) if bus.remote else None
+lobby_versions = SharedLobbyVersions(SessionLocal) if bus.remote else LobbyVersions()
+
+
+def _flush_shared(auction_id: str) -> None:
+    # With several processes the write-behind is flushed before an event
+    # goes out, so a write that lost to another process is refused here
+    # instead of being broadcast. The conflict is kept even when the
+    # background thread took the batch first.
+    writer.flush(auction_id)
+    if bus.remote and writer.take_conflict(auction_id):
+        runtimes.invalidate(auction_id, draft=True)
+        history.invalidate(auction_id)
+        raise HTTPException(status_code=409, detail="Auction state changed, retry")
+
+T = TypeVar("T")
+
+
+async def _in_memory(auction_id: str | None, call: Callable[[], T]) -> T:
+    # Calls that only touch a loaded runtime and history are served on the
+    # event loop; anything that may need the database (a cold auction, or a
+    # lock held by an admin action) is handed to a worker thread instead.
+    if auction_id is not None and not bus.remote and history.loaded(auction_id):
+        lock = runtimes.lock(auction_id)
+        if lock.acquire(blocking=False):
+            try:
+                if runtimes.loaded(auction_id):
+                    return call()
+            finally:
+                lock.release()
+    return await asyncio.to_thread(call)
+
+
+def _game_state(auction_id: str) -> GameStateOut:
+    with runtimes.lock(auction_id):
+        return _runtime_to_out(runtimes.get(auction_id))
+
+
+def _state_payload(db: Session, auction_id: str) -> dict:
+    writer.flush(auction_id)
+    state = _ensure_game_state(db, auction_id)
+    return _state_to_out(state, history.recent(auction_id)).model_dump(by_alias=True)
+
+
+def _lobby_payload(db: Session, auction_id: str, version: int | None = None) -> dict:
+    if version is None:
+        version = lobby_versions.current(auction_id)
     players = db.scalars(
         select(Player)
         .where(Player.auction_id == auction_id)
         .order_by(Player.order_index.is_(None), Player.order_index)
     ).all()
     teams = db.scalars(select(Team).where(Team.auction_id == auction_id)).all()
-    return {"auctionId": auction_id, "teams": _teams_out(teams), "players": _players_out(players)}
-
-
-def _roster_count(db: Session, team_id: str) -> int:
-    return db.query(Player).filter(Player.sold_to_team_id == team_id).count()
+    return {
+        "auctionId": auction_id,
+        "version": version,
+        "teams": _teams_out(teams),
+        "players": _players_out(players),
+    }
 
 
 @app.on_event("startup")
 async def on_startup() -> None:
-    Base.metadata.create_all(bind=engine)
+    migrate(engine)
     app.state.loop = asyncio.get_running_loop()
-    app.state.broadcast_queue = asyncio.Queue()
+    app.state.loop.set_default_executor(ThreadPoolExecutor(max_workers=THREADPOOL_SIZE))
+    anyio.to_thread.current_default_thread_limiter().total_tokens = THREADPOOL_SIZE
+    dispatcher.bind(app.state.loop)
+    timers.bind(app.state.loop)
+    writer.start()
+    bus.start()
+    db = SessionLocal()
+    try:
+        admin_sessions.purge(db)
+        running_states = db.scalars(
+            select(GameState).where(GameState.is_timer_running.is_(True))
+        ).all()
+        for state in running_states:
+            timers.start(state.auction_id, state.timer_value)
+    finally:
+        db.close()
 
-    async def broadcast_worker() -> None:
-        while True:
-            message = await app.state.broadcast_queue.get()
-            target = message.get("auction_id")
-            payload = {"event": message["event"], "payload": message["payload"]}
-            if target:
-                await manager.broadcast_to(target, payload)
-            else:
-                await manager.broadcast(payload)
 
-    app.state.loop.create_task(broadcast_worker())
+@app.on_event("shutdown")
+def on_shutdown() -> None:
+    bus.stop()
+    writer.stop()
+    if leases is not None:
+        leases.release_all()
 
 
 @app.get("/health")
@@ -314,14 +614,26 @@ def health() -> dict:
     return {"status": "ok", "time": datetime.utcnow().isoformat()}
 
 
+@app.get("/game/admin/broadcast")
+def broadcast_stats(
+    db: Session = Depends(get_db),
+    authorization: str | None = Header(default=None),
+) -> dict:
+    _require_admin(db, authorization)
+    return {"queues": dispatcher.depth()}
+
+
 @app.post("/auth/login", response_model=AdminLoginResponse)
 def login(payload: AdminLoginRequest, db: Session = Depends(get_db)) -> AdminLoginResponse:
     if payload.admin_id != ADMIN_ID or payload.password != ADMIN_PW:
         raise HTTPException(status_code=401, detail="Invalid credentials")
-    token = str(uuid.uuid4())
-    db.add(AdminSession(token=token))
-    db.commit()
-    return AdminLoginResponse(token=token)
+    return AdminLoginResponse(token=admin_sessions.create(db))
+
+
+@app.post("/auth/logout", status_code=status.HTTP_204_NO_CONTENT)
+def logout(db: Session = Depends(get_db), authorization: str | None = Header(default=None)):
+    _require_admin(db, authorization)
+    admin_sessions.revoke(db, authorization.replace("Bearer ", "", 1).strip())
 
  
 @app.post("/auctions", response_model=AuctionCreateResponse)
@@ -399,26 +711,126 @@ def validate_invite(code: str, db: Session = Depends(get_db)) -> InviteValidateR
     return InviteValidateResponse(valid=True, auction_id=auction.id)
 
 
+def _connect_frames(auction_id: str) -> tuple[str, str]:
+    writer.flush(auction_id)
+    db = SessionLocal()
+    try:
+        lobby = _lobby_payload(db, auction_id)
+        state = _state_payload(db, auction_id)
+    finally:
+        db.close()
+    return (
+        encode_json({"event": "lobby_update", "payload": lobby}),
+        encode_json({"event": "state_sync", "payload": state}),
+    )
+
+
+connect_snapshots: SnapshotCache[tuple[str, str]] = SnapshotCache(_connect_frames)
+
+
+def _snapshot_key(auction_id: str) -> tuple:
+    # Everything a connect snapshot shows moves one of these: lobby edits
+    # bump the lobby version, bids and rounds append to the log history, and
+    # a running clock is described by its absolute endsAt.
+    timer = timers.snapshot(auction_id)
+    paused_at = timer[0] if timer is not None and not timer[1] else None
+    return (
+        lobby_versions.current(auction_id),
+        history.revision(auction_id),
+        timer is not None and timer[1],
+        paused_at,
+    )
+
+
+async def _snapshot_frames(auction_id: str) -> tuple[str, str]:
+    key = _snapshot_key(auction_id)
+    frames = connect_snapshots.cached(auction_id, key)
+    if frames is None:
+        frames = await asyncio.to_thread(connect_snapshots.get, auction_id, key)
+    return frames
+
+
+async def _send_snapshots(websocket: WebSocket, auction_id: str) -> None:
+    lobby, state = await _snapshot_frames(auction_id)
+    manager.send_frame(websocket, lobby)
+    manager.send_frame(websocket, state)
+
+
+def _ack(websocket: WebSocket, request_id: object, **payload: object) -> None:
+    manager.send(websocket, {"event": "ack", "payload": {"id": request_id, **payload}})
+
+
+async def _handle_client_message(
+    websocket: WebSocket, auction_id: str | None, message: dict, received_at: float
+) -> None:
+    kind = message.get("type")
+    request_id = message.get("id")
+    if kind == "ping":
+        manager.send(
+            websocket,
+            {
+                "event": "pong",
+                "payload": {
+                    "id": request_id,
+                    "t0": message.get("t0"),
+                    "receivedAt": received_at,
+                    "serverTime": time.time(),
+                },
+            },
+        )
+        return
+    if not auction_id:
+        _ack(websocket, request_id, ok=False, status=400, detail="Missing auction id")
+        return
+    if kind == "lobby_resync":
+        lobby, _ = await _snapshot_frames(auction_id)
+        manager.send_frame(websocket, lobby)
+    elif kind == "resync":
+        await _send_snapshots(websocket, auction_id)
+        _ack(websocket, request_id, ok=True)
+    elif kind == "bid" and manager.is_viewer(websocket):
+        _ack(websocket, request_id, ok=False, status=403, detail="Viewers cannot bid")
+    elif kind == "bid":
+        try:
+            payload = BidRequest.model_validate(message)
+            result = await _in_memory(
+                runtimes.team_auction(payload.team_id), partial(_place_bid, payload, auction_id)
+            )
+        except ValidationError as exc:
+            _ack(websocket, request_id, ok=False, status=422, detail=exc.errors())
+        except HTTPException as exc:
+            _ack(websocket, request_id, ok=False, status=exc.status_code, detail=exc.detail)
+        else:
+            _ack(websocket, request_id, ok=True, state=result.model_dump(by_alias=True))
+    else:
+        _ack(websocket, request_id, ok=False, status=400, detail="Unknown message type")
+
+
 @app.websocket("/ws")
 async def websocket_endpoint(websocket: WebSocket) -> None:
     auction_id = websocket.query_params.get("auctionId")
-    await manager.connect(websocket, auction_id)
+    await manager.connect(
+        websocket,
+        auction_id,
+        binary=websocket.query_params.get("proto") == "binary",
+        viewer=websocket.query_params.get("role") == "viewer",
+    )
     try:
         if auction_id:
-            db = next(get_db())
-            try:
-                await websocket.send_json(
-                    {"event": "lobby_update", "payload": _lobby_payload(db, auction_id)}
-                )
-                await websocket.send_json(
-                    {"event": "state_sync", "payload": _state_payload(db, auction_id)}
-                )
-            finally:
-                db.close()
+            await _send_snapshots(websocket, auction_id)
 
         while True:
-            await websocket.receive_text()
+            text = await websocket.receive_text()
+            received_at = time.time()
+            try:
+                message = json.loads(text)
+            except ValueError:
+                continue
+            if isinstance(message, dict):
+                await _handle_client_message(websocket, auction_id, message, received_at)
     except WebSocketDisconnect:
+        pass
+    finally:
         manager.disconnect(websocket)
 
 
@@ -434,44 +846,47 @@ def create_player(
     auction = db.get(Auction, auction_id)
     if not auction:
         raise HTTPException(status_code=404, detail="Auction not found")
-    incoming_key = _player_key(
+    key = player_dedupe_key(
         payload.name, payload.tiers.tank, payload.tiers.dps, payload.tiers.supp
     )
-    existing_players = db.scalars(
-        select(Player).where(Player.auction_id == auction_id)
-    ).all()
-    for existing in existing_players:
-        if incoming_key == _player_key(
-            existing.name, existing.tank_tier, existing.dps_tier, existing.supp_tier
-        ):
-            return _player_to_out(existing)
-    player_id = payload.id or str(uuid.uuid4())
-    player = Player(
-        id=player_id,
-        auction_id=auction_id,
-        name=payload.name,
-        tank_tier=payload.tiers.tank,
-        dps_tier=payload.tiers.dps,
-        supp_tier=payload.tiers.supp,
+    result = db.execute(
+        insert_or_ignore(Player, "auction_id", "dedupe_key").values(
+            id=payload.id or str(uuid.uuid4()),
+            auction_id=auction_id,
+            name=payload.name,
+            tank_tier=payload.tiers.tank,
+            dps_tier=payload.tiers.dps,
+            supp_tier=payload.tiers.supp,
+            status="waiting",
+            dedupe_key=key,
+            **player_ratings(payload.tiers.tank, payload.tiers.dps, payload.tiers.supp),
+        )
     )
-    db.add(player)
     db.commit()
-    db.refresh(player)
-    _broadcast("lobby_update", _lobby_payload(db, auction_id))
+    player = db.scalars(
+        select(Player).where(Player.auction_id == auction_id, Player.dedupe_key == key)
+    ).one()
+    if result.rowcount == 0:
+        return _player_to_out(player)
+    runtimes.invalidate(auction_id, draft=True)
+    _broadcast_lobby_patch(auction_id, [_player_patch(player)])
     return _player_to_out(player)
 
 
 @app.get("/players", response_model=list[PlayerOut])
 def list_players(
+    sort: Literal["order", "rating"] = Query(default="order"),
     db: Session = Depends(get_db),
     auction_id: str | None = Header(default=None, alias="X-Auction-Id"),
 ) -> list[PlayerOut]:
     auction_id = _require_auction_id(auction_id)
-    players = db.scalars(
-        select(Player)
-        .where(Player.auction_id == auction_id)
-        .order_by(Player.order_index.is_(None), Player.order_index)
-    ).all()
+    writer.flush(auction_id)
+    query = select(Player).where(Player.auction_id == auction_id)
+    if sort == "rating":
+        query = query.order_by(Player.rating.desc())
+    else:
+        query = query.order_by(Player.order_index.is_(None), Player.order_index)
+    players = db.scalars(query).all()
     return [_player_to_out(player) for player in players]
 
 
@@ -482,6 +897,7 @@ def get_player(
     auction_id: str | None = Header(default=None, alias="X-Auction-Id"),
 ) -> PlayerOut:
     auction_id = _require_auction_id(auction_id)
+    writer.flush(auction_id)
     player = db.get(Player, player_id)
     if not player or player.auction_id != auction_id:
         raise HTTPException(status_code=404, detail="Player not found")
@@ -498,27 +914,40 @@ def update_player(
 ) -> PlayerOut:
     _require_admin(db, authorization)
     auction_id = _require_auction_id(auction_id)
-    player = db.get(Player, player_id)
-    if not player or player.auction_id != auction_id:
-        raise HTTPException(status_code=404, detail="Player not found")
-    if payload.name is not None:
-        player.name = payload.name
-    if payload.tiers is not None:
-        player.tank_tier = payload.tiers.tank
-        player.dps_tier = payload.tiers.dps
-        player.supp_tier = payload.tiers.supp
-    if payload.status is not None:
-        player.status = payload.status
-    if payload.sold_to_team_id is not None:
-        player.sold_to_team_id = payload.sold_to_team_id
-    if payload.sold_price is not None:
-        player.sold_price = payload.sold_price
-    if payload.order_index is not None:
-        player.order_index = payload.order_index
-    db.commit()
-    db.refresh(player)
-    _broadcast("lobby_update", _lobby_payload(db, auction_id))
-    return _player_to_out(player)
+    with runtimes.exclusive(auction_id):
+        player = db.get(Player, player_id)
+        if not player or player.auction_id != auction_id:
+            raise HTTPException(status_code=404, detail="Player not found")
+        if payload.name is not None:
+            player.name = payload.name
+        if payload.tiers is not None:
+            player.tank_tier = payload.tiers.tank
+            player.dps_tier = payload.tiers.dps
+            player.supp_tier = payload.tiers.supp
+            for column, rating in player_ratings(
+                player.tank_tier, player.dps_tier, player.supp_tier
+            ).items():
+                setattr(player, column, rating)
+        if payload.status is not None:
+            player.status = payload.status
+        if payload.sold_to_team_id is not None:
+            player.sold_to_team_id = payload.sold_to_team_id
+        if payload.sold_price is not None:
+            player.sold_price = payload.sold_price
+        if payload.order_index is not None:
+            player.order_index = payload.order_index
+        player.dedupe_key = player_dedupe_key(
+            player.name, player.tank_tier, player.dps_tier, player.supp_tier
+        )
+        try:
+            db.commit()
+        except IntegrityError:
+            db.rollback()
+            raise HTTPException(status_code=409, detail="Duplicate player")
+        runtimes.invalidate(auction_id, draft=True)
+        db.refresh(player)
+        _broadcast_lobby_patch(auction_id, [_player_patch(player)])
+        return _player_to_out(player)
 
 
 @app.delete("/players/{player_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -530,12 +959,14 @@ def delete_player(
 ):
     _require_admin(db, authorization)
     auction_id = _require_auction_id(auction_id)
-    player = db.get(Player, player_id)
-    if not player or player.auction_id != auction_id:
-        raise HTTPException(status_code=404, detail="Player not found")
-    db.delete(player)
-    db.commit()
-    _broadcast("lobby_update", _lobby_payload(db, auction_id))
+    with runtimes.exclusive(auction_id):
+        player = db.get(Player, player_id)
+        if not player or player.auction_id != auction_id:
+            raise HTTPException(status_code=404, detail="Player not found")
+        db.delete(player)
+        db.commit()
+        runtimes.invalidate(auction_id, draft=True)
+        _broadcast_lobby_patch(auction_id, [player_remove(player_id)])
 
 
 @app.post("/players/parse-log", response_model=list[PlayerCreate])
@@ -545,134 +976,110 @@ def parse_log(
     authorization: str | None = Header(default=None),
 ) -> list[PlayerCreate]:
     _require_admin(db, authorization)
-    def normalize_tier_prefix(prefix: str) -> str:
-        mapping = {
-            "그랜드마스터": "그마",
-            "그마": "그마",
-            "그": "그마",
-            "챔피언": "챔",
-            "챔": "챔",
-            "마스터": "마",
-            "마": "마",
-            "다이아": "다",
-            "다야": "다",
-            "다": "다",
-            "플레티넘": "플",
-            "플레": "플",
-            "플": "플",
-            "골드": "골",
-            "골": "골",
-            "실버": "실",
-            "실": "실",
-            "브론즈": "브",
-            "브": "브",
-        }
-        return mapping.get(prefix, prefix)
-
-    def extract_tiers(text: str) -> list[str]:
-        normalized = text.replace(",", " ").replace("/", " ")
-        normalized = normalized.replace("탱", " 탱").replace("딜", " 딜").replace("힐", " 힐")
-        rank_tokens = re.findall(
-            r"(그랜드마스터|그마|그|챔피언|챔|마스터|마|다이아|다야|다|플레티넘|플레|플|골드|골|실버|실|브론즈|브)\s*(\d+)",
-            normalized,
-        )
-        role_tokens = re.findall(r"(탱|딜|힐)\s*(\d+)", normalized)
-        symbol_count = len(re.findall(r"(^|\s)[Xx]\b", normalized))
+    return [
+        PlayerCreate(name=name, tiers={"tank": tank, "dps": dps, "supp": supp})
+        for name, (tank, dps, supp) in parse_players(payload.text.splitlines())
+    ]
 
-        if len(rank_tokens) >= 3:
-            return [
-                f"{normalize_tier_prefix(prefix)}{number}"
-                for prefix, number in rank_tokens[:3]
-            ]
 
-        tank = "N/A"
-        dps = "N/A"
-        supp = "N/A"
-
-        if role_tokens:
-            base_prefix = normalize_tier_prefix(rank_tokens[0][0]) if rank_tokens else ""
-            for role, number in role_tokens:
-                value = f"{base_prefix}{number}" if base_prefix else f"N/A"
-                if role == "탱":
-                    tank = value
-                if role == "딜":
-                    dps = value
-                if role == "힐":
-                    supp = value
-            return [tank, dps, supp]
-
-        if symbol_count:
-            ranks = [
-                f"{normalize_tier_prefix(prefix)}{number}"
-                for prefix, number in rank_tokens
-            ]
-            if len(ranks) == 1:
-                return ["N/A", ranks[0], "N/A"]
-            if len(ranks) == 2:
-                return ["N/A", ranks[0], ranks[1]]
-
-        if len(rank_tokens) == 2:
-            ranks = [
-                f"{normalize_tier_prefix(prefix)}{number}"
-                for prefix, number in rank_tokens
-            ]
-            return [ranks[0], ranks[1], "N/A"]
-
-        if len(rank_tokens) == 1:
-            rank = f"{normalize_tier_prefix(rank_tokens[0][0])}{rank_tokens[0][1]}"
-            if "딜" in normalized:
-                return ["N/A", rank, "N/A"]
-            if "힐" in normalized:
-                return ["N/A", "N/A", rank]
-            if "탱" in normalized:
-                return [rank, "N/A", "N/A"]
-            return [rank, "N/A", "N/A"]
-
-        return [tank, dps, supp]
-
-    def has_tiers(text: str) -> bool:
-        return bool(
-            re.search(
-                r"(그랜드마스터|그마|그|챔피언|챔|마스터|마|다이아|다야|다|플레티넘|플레|플|골드|골|실버|실|브론즈|브)\s*\d+",
-                text,
-            )
-            or re.search(r"(탱|딜|힐)\s*\d+", text)
-        )
+def _import_progress(auction_id: str, stage: str, count: int) -> None:
+    _broadcast_for_auction(auction_id, "import_progress", {"stage": stage, "count": count})
 
-    def clean_line(text: str) -> str:
-        cleaned = text.strip()
-        if "—" in cleaned:
-            cleaned = cleaned.split("—", 1)[0].strip()
-        return cleaned
 
-    players: list[PlayerCreate] = []
-    pending_name: str | None = None
+def _import_players(
+    auction_id: str | None,
+    authorization: str | None,
+    import_type: str,
+    chunks: Iterator[bytes],
+) -> PlayerImportResult:
+    db = SessionLocal()
+    try:
+        _require_admin(db, authorization)
+        auction_id = _require_auction_id(auction_id)
+        if not db.get(Auction, auction_id):
+            raise HTTPException(status_code=404, detail="Auction not found")
+        errors: list[PlayerImportError] = []
+        rows: list[dict] = []
+        seen: set[str] = set()
+        received = 0
+        for entry in READERS[import_type](iter_lines(chunks), errors):
+            received += 1
+            key = player_dedupe_key(
+                entry.name, entry.tiers.tank, entry.tiers.dps, entry.tiers.supp
+            )
+            if key in seen:
+                continue
+            seen.add(key)
+            rows.append(
+                {
+                    "id": entry.id or str(uuid.uuid4()),
+                    "auction_id": auction_id,
+                    "name": entry.name,
+                    "tank_tier": entry.tiers.tank,
+                    "dps_tier": entry.tiers.dps,
+                    "supp_tier": entry.tiers.supp,
+                    "status": "waiting",
+                    "dedupe_key": key,
+                    **player_ratings(entry.tiers.tank, entry.tiers.dps, entry.tiers.supp),
+                }
+            )
+            if received % IMPORT_CHUNK_SIZE == 0:
+                _import_progress(auction_id, "parsed", received)
+        # The body is read in full before the write transaction opens, so a
+        # slow upload never holds the database lock. Players already in the
+        # auction are skipped by the unique dedupe key index.
+        inserted = 0
+        statement = insert_or_ignore(Player, "auction_id", "dedupe_key")
+        try:
+            # ON CONFLICT only covers the dedupe key, so a reused id fails here.
+            for start in range(0, len(rows), IMPORT_CHUNK_SIZE):
+                chunk = rows[start : start + IMPORT_CHUNK_SIZE]
+                inserted += db.connection().execute(statement, chunk).rowcount
+                _import_progress(auction_id, "inserted", inserted)
+            db.commit()
+        except IntegrityError:
+            db.rollback()
+            raise HTTPException(status_code=409, detail="Player id already exists")
+        if inserted:
+            runtimes.invalidate(auction_id, draft=True)
+            _broadcast_lobby(db, auction_id)
+        return PlayerImportResult(
+            received=received,
+            inserted=inserted,
+            duplicates=received - inserted,
+            errors=errors,
+        )
+    finally:
+        db.close()
 
-    for raw in payload.text.splitlines():
-        line = clean_line(raw)
-        if not line:
-            continue
 
-        if has_tiers(line):
-            tiers = extract_tiers(line)
-            name = pending_name or re.sub(
-                r"(그랜드마스터|그마|그|챔피언|챔|마스터|마|다이아|다야|다|플레티넘|플레|플|골드|골|실버|실|브론즈|브)\s*\d+|(탱|딜|힐)\s*\d+",
-                "",
-                line,
-            ).strip()
-            if not name:
-                name = "Unknown"
-            players.append(
-                PlayerCreate(
-                    name=name,
-                    tiers={"tank": tiers[0], "dps": tiers[1], "supp": tiers[2]},
-                )
-            )
-            pending_name = None
-        else:
-            pending_name = line
+@app.post("/players/import", response_model=PlayerImportResult)
+async def import_players(
+    request: Request,
+    import_type: str | None = Query(default=None, alias="format"),
+    authorization: str | None = Header(default=None),
+    auction_id: str | None = Header(default=None, alias="X-Auction-Id"),
+) -> PlayerImportResult:
+    import_type = import_type or import_format(request.headers.get("content-type"))
+    if import_type not in IMPORT_FORMATS:
+        raise HTTPException(status_code=400, detail="Unsupported import format")
+    loop = asyncio.get_running_loop()
+    stream = request.stream()
+
+    async def next_chunk() -> bytes:
+        return await anext(stream)
+
+    def chunks() -> Iterator[bytes]:
+        # Pulls the body from the event loop while the import runs in a worker.
+        while True:
+            try:
+                yield asyncio.run_coroutine_threadsafe(next_chunk(), loop).result()
+            except StopAsyncIteration:
+                return
 
-    return players
+    return await asyncio.to_thread(
+        _import_players, auction_id, authorization, import_type, chunks()
+    )
 
 
 @app.post("/teams", response_model=TeamOut, status_code=status.HTTP_201_CREATED)
@@ -697,8 +1104,9 @@ def create_team(
     )
     db.add(team)
     db.commit()
+    runtimes.invalidate(auction_id)
     db.refresh(team)
-    _broadcast("lobby_update", _lobby_payload(db, auction_id))
+    _broadcast_lobby_patch(auction_id, [_team_patch(team)])
     return _team_to_out(team)
 
 
@@ -721,8 +1129,9 @@ def join_lobby(payload: JoinLobbyRequest, db: Session = Depends(get_db)) -> Team
     )
     db.add(team)
     db.commit()
+    runtimes.invalidate(auction.id)
     db.refresh(team)
-    _broadcast("lobby_update", _lobby_payload(db, auction.id))
+    _broadcast_lobby_patch(auction.id, [_team_patch(team)])
     return _team_to_out(team)
 
 
@@ -732,6 +1141,7 @@ def list_teams(
     auction_id: str | None = Header(default=None, alias="X-Auction-Id"),
 ) -> list[TeamOut]:
     auction_id = _require_auction_id(auction_id)
+    writer.flush(auction_id)
     teams = db.scalars(select(Team).where(Team.auction_id == auction_id)).all()
     return [_team_to_out(team) for team in teams]
 
@@ -743,6 +1153,7 @@ def get_team(
     auction_id: str | None = Header(default=None, alias="X-Auction-Id"),
 ) -> TeamOut:
     auction_id = _require_auction_id(auction_id)
+    writer.flush(auction_id)
     team = db.get(Team, team_id)
     if not team or team.auction_id != auction_id:
         raise HTTPException(status_code=404, detail="Team not found")
@@ -759,26 +1170,28 @@ def update_team(
 ) -> TeamOut:
     _require_admin(db, authorization)
     auction_id = _require_auction_id(auction_id)
-    team = db.get(Team, team_id)
-    if not team or team.auction_id != auction_id:
-        raise HTTPException(status_code=404, detail="Team not found")
-    if payload.name is not None:
-        team.name = payload.name
-    if payload.captain_name is not None:
-        team.captain_name = payload.captain_name
-    if payload.points is not None:
-        team.points = payload.points
-    if payload.captain_stats is not None:
-        team.captain_tank = payload.captain_stats.tank
-        team.captain_dps = payload.captain_stats.dps
-        team.captain_supp = payload.captain_stats.supp
-    db.commit()
-    db.refresh(team)
-    _broadcast_for_auction(
-        auction_id, "point_change", {"teamId": team.id, "newPoints": team.points}
-    )
-    _broadcast("lobby_update", _lobby_payload(db, auction_id))
-    return _team_to_out(team)
+    with runtimes.exclusive(auction_id):
+        team = db.get(Team, team_id)
+        if not team or team.auction_id != auction_id:
+            raise HTTPException(status_code=404, detail="Team not found")
+        if payload.name is not None:
+            team.name = payload.name
+        if payload.captain_name is not None:
+            team.captain_name = payload.captain_name
+        if payload.points is not None:
+            team.points = payload.points
+        if payload.captain_stats is not None:
+            team.captain_tank = payload.captain_stats.tank
+            team.captain_dps = payload.captain_stats.dps
+            team.captain_supp = payload.captain_stats.supp
+        db.commit()
+        runtimes.invalidate(auction_id)
+        db.refresh(team)
+        _broadcast_for_auction(
+            auction_id, "point_change", {"teamId": team.id, "newPoints": team.points}
+        )
+        _broadcast_lobby_patch(auction_id, [_team_patch(team)])
+        return _team_to_out(team)
 
 
 @app.patch("/teams/{team_id}/points", response_model=TeamOut)
@@ -791,20 +1204,22 @@ def update_team_points(
 ) -> TeamOut:
     _require_admin(db, authorization)
     auction_id = _require_auction_id(auction_id)
-    team = db.get(Team, team_id)
-    if not team or team.auction_id != auction_id:
-        raise HTTPException(status_code=404, detail="Team not found")
-    if "points" not in payload:
-        raise HTTPException(status_code=400, detail="Missing points")
-    team.points = int(payload["points"])
-    db.commit()
-    db.refresh(team)
-    _log(db, auction_id, f"POINT UPDATE: {team.name} -> {team.points}")
-    _broadcast_for_auction(
-        auction_id, "point_change", {"teamId": team.id, "newPoints": team.points}
-    )
-    _broadcast("lobby_update", _lobby_payload(db, auction_id))
-    return _team_to_out(team)
+    with runtimes.exclusive(auction_id):
+        team = db.get(Team, team_id)
+        if not team or team.auction_id != auction_id:
+            raise HTTPException(status_code=404, detail="Team not found")
+        if "points" not in payload:
+            raise HTTPException(status_code=400, detail="Missing points")
+        team.points = int(payload["points"])
+        db.commit()
+        runtimes.invalidate(auction_id)
+        db.refresh(team)
+        _log(db, auction_id, f"POINT UPDATE: {team.name} -> {team.points}")
+        _broadcast_for_auction(
+            auction_id, "point_change", {"teamId": team.id, "newPoints": team.points}
+        )
+        _broadcast_lobby_patch(auction_id, [team_points(team.id, team.points)])
+        return _team_to_out(team)
 
  
 @app.delete("/teams/{team_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -816,49 +1231,89 @@ def delete_team(
 ):
     _require_admin(db, authorization)
     auction_id = _require_auction_id(auction_id)
-    team = db.get(Team, team_id)
-    if not team or team.auction_id != auction_id:
-        raise HTTPException(status_code=404, detail="Team not found")
-    db.delete(team)
-    db.commit()
-    _broadcast("lobby_update", _lobby_payload(db, auction_id))
+    with runtimes.exclusive(auction_id):
+        team = db.get(Team, team_id)
+        if not team or team.auction_id != auction_id:
+            raise HTTPException(status_code=404, detail="Team not found")
+        db.delete(team)
+        db.commit()
+        runtimes.invalidate(auction_id)
+        _broadcast_lobby_patch(auction_id, [team_remove(team_id)])
 
 
 @app.get("/game/state", response_model=GameStateOut)
-def get_game_state(
-    db: Session = Depends(get_db),
+async def get_game_state(
     auction_id: str | None = Header(default=None, alias="X-Auction-Id"),
 ) -> GameStateOut:
     auction_id = _require_auction_id(auction_id)
-    state = _ensure_game_state(db, auction_id)
-    logs = db.scalars(
-        select(BidLog)
-        .where(BidLog.auction_id == auction_id)
-        .order_by(BidLog.id.desc())
-        .limit(50)
-    ).all()
-    history = [log.message for log in logs]
-    return _state_to_out(state, history)
+    return await _in_memory(auction_id, partial(_game_state, auction_id))
 
 
 @app.get("/game/logs", response_model=list[BidLogOut])
 def get_game_logs(
+    before: int | None = Query(default=None),
+    limit: int = Query(default=100, ge=1, le=500),
     db: Session = Depends(get_db),
     auction_id: str | None = Header(default=None, alias="X-Auction-Id"),
 ) -> list[BidLogOut]:
     auction_id = _require_auction_id(auction_id)
-    logs = db.scalars(
-        select(BidLog)
-        .where(BidLog.auction_id == auction_id)
-        .order_by(BidLog.id.desc())
-        .limit(100)
-    ).all()
+    writer.flush(auction_id)
+    query = select(BidLog).where(BidLog.auction_id == auction_id)
+    if before is not None:
+        query = query.where(BidLog.id < before)
+    logs = db.scalars(query.order_by(BidLog.id.desc()).limit(limit)).all()
     return [
-        BidLogOut(message=log.message, created_at=log.created_at.isoformat())
+        BidLogOut(id=log.id, message=log.message, created_at=log.created_at.isoformat())
         for log in logs
     ]
 
 
+def _sync_pool(
+    db: Session, auction_id: str, pool: list[Player], entries: list[PlayerCreate]
+) -> list[Player]:
+    # Diffs an uploaded list against the registered players by dedupe key:
+    # matches keep their ids, new entries are inserted and players missing
+    # from the upload are removed. Returns the pool in upload order.
+    existing = {
+        player.dedupe_key
+        or player_dedupe_key(player.name, player.tank_tier, player.dps_tier, player.supp_tier): player
+        for player in pool
+    }
+    players: list[Player] = []
+    seen = set()
+    for entry in entries:
+        key = player_dedupe_key(entry.name, entry.tiers.tank, entry.tiers.dps, entry.tiers.supp)
+        if key in seen:
+            continue
+        seen.add(key)
+        player = existing.pop(key, None)
+        if player is None:
+            player = Player(
+                id=entry.id or str(uuid.uuid4()),
+                auction_id=auction_id,
+                name=entry.name,
+                tank_tier=entry.tiers.tank,
+                dps_tier=entry.tiers.dps,
+                supp_tier=entry.tiers.supp,
+                status="waiting",
+                dedupe_key=key,
+                **player_ratings(entry.tiers.tank, entry.tiers.dps, entry.tiers.supp),
+            )
+            db.add(player)
+        players.append(player)
+    if existing:
+        db.execute(
+            delete(Player).where(Player.id.in_([player.id for player in existing.values()])),
+            execution_options={"synchronize_session": False},
+        )
+    try:
+        db.flush()
+    except IntegrityError:
+        db.rollback()
+        raise HTTPException(status_code=409, detail="Duplicate player")
+    return players
+
+
 @app.post("/game/start", response_model=GameStateOut)
 def start_game(
     payload: StartGameRequest,
@@ -868,125 +1323,154 @@ def start_game(
 ) -> GameStateOut:  
     _require_admin(db, authorization)
     auction_id = _require_auction_id(auction_id)
-    auction = db.get(Auction, auction_id)
-    if not auction:
-        raise HTTPException(status_code=404, detail="Auction not found")
-    if not payload.player_list:
-        raise HTTPException(status_code=400, detail="Player list is empty")
-
-    db.query(Player).filter(Player.auction_id == auction_id).delete()
-    db.query(BidLog).filter(BidLog.auction_id == auction_id).delete()
-    db.commit()
-
-    unique_entries: list[PlayerCreate] = []
-    seen = set()
-    for entry in payload.player_list:
-        key = _player_key(entry.name, entry.tiers.tank, entry.tiers.dps, entry.tiers.supp)
-        if key in seen:
-            continue
-        seen.add(key)
-        unique_entries.append(entry)
-
-    players: list[Player] = []
-    for entry in unique_entries:
-        player = Player(
-            id=entry.id or str(uuid.uuid4()),
-            auction_id=auction_id,
-            name=entry.name,
-            tank_tier=entry.tiers.tank,
-            dps_tier=entry.tiers.dps,
-            supp_tier=entry.tiers.supp,
-            status="waiting",
+    with runtimes.exclusive(auction_id):
+        auction = db.get(Auction, auction_id)
+        if not auction:
+            raise HTTPException(status_code=404, detail="Auction not found")
+        players = list(
+            db.scalars(
+                select(Player)
+                .where(Player.auction_id == auction_id)
+                .order_by(Player.order_index.is_(None), Player.order_index)
+            )
+        )
+        if payload.player_list is not None:
+            players = _sync_pool(db, auction_id, players, payload.player_list)
+        if not players:
+            raise HTTPException(status_code=400, detail="Player list is empty")
+        if payload.order_type == "rand":
+            # Shuffled from id order, so a seed gives the same draft each time.
+            players.sort(key=lambda player: player.id)
+            random.Random(payload.seed).shuffle(players)
+        elif payload.order_type in TIER_ORDERS:
+            table = RatingTable(
+                [player.tank_rating for player in players],
+                [player.dps_rating for player in players],
+                [player.supp_rating for player in players],
+            )
+            teams = db.scalar(select(func.count(Team.id)).where(Team.auction_id == auction_id))
+            players = [players[index] for index in table.order(payload.order_type, teams or 1)]
+
+        # Player ids and the bid log survive a restart; only the draft
+        # columns are reset, with the new order written in one executemany.
+        db.execute(
+            update(Player)
+            .where(Player.auction_id == auction_id)
+            .values(status="waiting", sold_to_team_id=None, sold_price=None),
+            execution_options={"synchronize_session": False},
+        )
+        db.execute(
+            update(Player),
+            [{"id": player.id, "order_index": idx} for idx, player in enumerate(players)],
+        )
+        draft = DraftQueue.build(
+            {
+                **_player_to_out(player).model_dump(by_alias=True),
+                "status": "waiting",
+                "soldToTeamId": None,
+                "soldPrice": None,
+                "orderIndex": idx,
+            }
+            for idx, player in enumerate(players)
+        )
+        current_player = draft.pop_next()
+        db.execute(
+            update(Player)
+            .where(Player.id == current_player["id"])
+            .values(status="bidding"),
+            execution_options={"synchronize_session": False},
         )
-        players.append(player)
-    if payload.order_type == "rand":
-        random.shuffle(players)
-    for idx, player in enumerate(players):
-        player.order_index = idx
-        db.add(player)
-    db.commit()
 
-    state = _ensure_game_state(db, auction_id)
-    state.phase = "AUCTION"
-    state.current_bid = 0
-    state.high_bidder_id = None
-    state.last_bid_team_id = None
-    state.timer_value = DEFAULT_TIMER
-    state.is_timer_running = False
-    timer_stop_event.set()
+        state = _ensure_game_state(db, auction_id)
+        state.phase = "AUCTION"
+        state.current_bid = 0
+        state.high_bidder_id = None
+        state.last_bid_team_id = None
+        state.timer_value = timers.reset(auction_id, DEFAULT_TIMER)
+        state.is_timer_running = False
+        state.auto_hammer = (
+            payload.auto_hammer if payload.auto_hammer is not None else AUTO_HAMMER
+        )
 
-    auction.status = "LIVE"
+        auction.status = "LIVE"
+        state.current_player_id = current_player["id"]
+
+        db.commit()
+        runtimes.install_draft(auction_id, draft)
+        db.refresh(state)
+        _log(db, auction_id, "GAME STARTED")
+        _broadcast_for_auction(auction_id, "game_started", {})
+        _broadcast_for_auction(
+            auction_id,
+            "new_round",
+            {
+                "player": current_player,
+                "endTime": time.time() + state.timer_value,
+                "endsAt": None,
+            },
+        )
+        _broadcast_lobby(db, auction_id)
+        return _state_to_out(state, history.recent(auction_id))
 
-    current_player = players[0]
-    current_player.status = "bidding"
-    state.current_player_id = current_player.id
 
-    db.commit()
-    db.refresh(state)
-    _log(db, auction_id, "GAME STARTED")
-    _broadcast_for_auction(auction_id, "game_started", {})
+def _team_auction_id(team_id: str) -> str:
+    auction_id = runtimes.team_auction(team_id)
+    if auction_id is not None:
+        return auction_id
+    db = SessionLocal()
+    try:
+        team = db.get(Team, team_id)
+        if not team:
+            raise HTTPException(status_code=404, detail="Team not found")
+        return team.auction_id
+    finally:
+        db.close()
+
+
+def _place_bid(payload: BidRequest, auction_id: str | None = None) -> GameStateOut:
+    team_auction_id = _team_auction_id(payload.team_id)
+    if auction_id is not None and team_auction_id != auction_id:
+        raise HTTPException(status_code=403, detail="Team is not in this auction")
+    auction_id = team_auction_id
+    with runtimes.lock(auction_id):
+        runtime = runtimes.get(auction_id)
+        timer_value, is_timer_running = _timer_values(runtime)
+        try:
+            team, new_bid = runtime.validate_bid(
+                payload.team_id,
+                payload.amount,
+                timer_value > 0 and is_timer_running,
+                payload.expected_version,
+            )
+        except BidRejected as exc:
+            raise HTTPException(status_code=exc.status_code, detail=exc.detail)
+        with timers.tentative(auction_id):
+            timer_value = timers.extend(auction_id, BONUS_TIME_ON_BID, MAX_TIMER)
+            if timer_value is None:
+                raise HTTPException(status_code=400, detail="Bidding is closed")
+            message = runtime.apply_bid(team, new_bid, timer_value)
+            writer.record(auction_id, runtime.state_fields(), log=message)
+            _flush_shared(auction_id)
+        history.append(auction_id, message)
+        result = _runtime_to_out(runtime)
     _broadcast_for_auction(
         auction_id,
-        "new_round",
-        {
-            "player": _player_to_out(current_player).model_dump(by_alias=True),
-            "endTime": time.time() + state.timer_value,
-        },
-    )
-    _broadcast("lobby_update", _lobby_payload(db, auction_id))
-    return _state_to_out(state, ["GAME STARTED"])
-
-
-@app.post("/game/bid", response_model=GameStateOut)
-def bid(payload: BidRequest, db: Session = Depends(get_db)) -> GameStateOut:
-    team = db.get(Team, payload.team_id)
-    if not team:
-        raise HTTPException(status_code=404, detail="Team not found")
-    state = _ensure_game_state(db, team.auction_id)
-    if state.timer_value <= 0 or not state.is_timer_running:
-        raise HTTPException(status_code=400, detail="Bidding is closed")
-    if state.last_bid_team_id == team.id:
-        raise HTTPException(status_code=400, detail="Consecutive bid not allowed")
-    if _roster_count(db, team.id) >= 4:
-        raise HTTPException(status_code=400, detail="Roster is full")
-    if payload.amount <= 0:
-        raise HTTPException(status_code=400, detail="Invalid bid amount")
-
-    new_bid = state.current_bid + payload.amount
-    if new_bid > team.points:
-        raise HTTPException(status_code=400, detail="Not enough points")
-
-    state.current_bid = new_bid
-    state.high_bidder_id = team.id
-    state.last_bid_team_id = team.id
-    state.timer_value = min(MAX_TIMER, state.timer_value + BONUS_TIME_ON_BID)
-    db.commit()
-    _log(db, team.auction_id, f"{team.name} bid {new_bid}")
-    _broadcast_for_auction(
-        team.auction_id,
         "bid_update",
         {
-            "currentBid": state.current_bid,
+            "currentBid": new_bid,
             "highBidder": team.id,
             "highBidderName": team.name,
-            "log": f"{team.name} bid {new_bid}",
+            "log": message,
+            "version": result.version,
         },
     )
-    _broadcast_for_auction(
-        team.auction_id,
-        "timer_sync",
-        {"timeLeft": state.timer_value, "isRunning": state.is_timer_running},
-    )
+    _broadcast("timer_sync", _timer_payload(auction_id, timer_value, True))
+    return result
 
-    logs = db.scalars(
-        select(BidLog)
-        .where(BidLog.auction_id == team.auction_id)
-        .order_by(BidLog.id.desc())
-        .limit(50)
-    ).all()
-    history = [log.message for log in logs]
-    db.refresh(state)
-    return _state_to_out(state, history) 
+
+@app.post("/game/bid", response_model=GameStateOut)
+async def bid(payload: BidRequest) -> GameStateOut:
+    return await _in_memory(runtimes.team_auction(payload.team_id), partial(_place_bid, payload))
 
 
 @app.post("/game/admin/timer", response_model=GameStateOut)
@@ -998,35 +1482,92 @@ def admin_timer(
 ) -> GameStateOut:
     _require_admin(db, authorization)
     auction_id = _require_auction_id(auction_id)
-    state = _ensure_game_state(db, auction_id)
-    if payload.action == "start":
-        state.is_timer_running = True
-    elif payload.action == "pause":
-        state.is_timer_running = False
-        timer_stop_event.set()
-    elif payload.action == "reset":
-        state.is_timer_running = False
-        state.timer_value = payload.value if payload.value is not None else DEFAULT_TIMER
-        timer_stop_event.set()
-    db.commit()
-    if payload.action == "start":
-        _start_timer_thread()
-    _log(db, auction_id, f"TIMER {payload.action.upper()}")
+    with runtimes.exclusive(auction_id):
+        state = _ensure_game_state(db, auction_id)
+        if payload.action == "start":
+            _claim_timer(auction_id)
+            _sync_timer_state(state)
+            state.timer_value = timers.start(auction_id, state.timer_value)
+            state.is_timer_running = True
+        elif payload.action == "pause":
+            state.timer_value = timers.pause(auction_id, state.timer_value)
+            state.is_timer_running = False
+        elif payload.action == "reset":
+            value = payload.value if payload.value is not None else DEFAULT_TIMER
+            state.timer_value = timers.reset(auction_id, value)
+            state.is_timer_running = False
+        db.commit()
+        _log(db, auction_id, f"TIMER {payload.action.upper()}")
+        _broadcast(
+            "timer_sync",
+            _timer_payload(auction_id, state.timer_value, state.is_timer_running),
+        )
+        _broadcast("state_sync", _state_payload(db, auction_id))
+        db.refresh(state)
+        return _state_to_out(state, history.recent(auction_id))
+
+
+def _settle_round(auction_id: str, action: str) -> GameStateOut:
+    with runtimes.lock(auction_id):
+        runtime = runtimes.get(auction_id)
+        try:
+            result = runtime.settle(action, DEFAULT_TIMER)
+        except BidRejected as exc:
+            raise HTTPException(status_code=exc.status_code, detail=exc.detail)
+        with timers.tentative(auction_id):
+            timers.reset(auction_id, DEFAULT_TIMER)
+            if runtime.is_timer_running:
+                runtime.timer_value = timers.start(auction_id, DEFAULT_TIMER)
+            for message in result.logs:
+                writer.record(auction_id, log=message)
+            rows = [
+                (
+                    Player,
+                    player["id"],
+                    {
+                        "status": player["status"],
+                        "sold_to_team_id": player["soldToTeamId"],
+                        "sold_price": player["soldPrice"],
+                    },
+                )
+                for player in result.changed
+            ]
+            if result.team is not None:
+                rows.append((Team, result.team.id, {"points": Team.points - result.price}))
+            if runtime.phase == "ENDED":
+                rows.append((Auction, auction_id, {"status": "ENDED"}))
+            writer.record(auction_id, runtime.state_fields(), rows=rows)
+            _flush_shared(auction_id)
+        for message in result.logs:
+            history.append(auction_id, message)
+        out = _runtime_to_out(runtime)
+
     _broadcast_for_auction(
         auction_id,
-        "timer_sync",
-        {"timeLeft": state.timer_value, "isRunning": state.is_timer_running},
+        "round_end",
+        {
+            "result": action,
+            "player": result.player,
+            "price": result.price,
+            "teamId": result.team.id if result.team else None,
+        },
     )
-    _broadcast("state_sync", _state_payload(db, auction_id))
-    logs = db.scalars(
-        select(BidLog)
-        .where(BidLog.auction_id == auction_id)
-        .order_by(BidLog.id.desc())
-        .limit(50)
-    ).all()
-    history = [log.message for log in logs]
-    db.refresh(state)
-    return _state_to_out(state, history)
+    if result.next_player is not None:
+        _broadcast_for_auction(
+            auction_id,
+            "new_round",
+            {
+                "player": result.next_player,
+                "endTime": time.time() + out.timer_value,
+                "endsAt": out.ends_at,
+            },
+        )
+    _broadcast("timer_sync", _timer_payload(auction_id, out.timer_value, out.is_timer_running))
+    lobby_ops = [player_upsert(player) for player in result.changed]
+    if result.team is not None:
+        lobby_ops.append(team_points(result.team.id, result.team.points))
+    _broadcast_lobby_patch(auction_id, lobby_ops)
+    return out
 
 
 @app.post("/game/admin/decision", response_model=GameStateOut)
@@ -1038,112 +1579,4 @@ def admin_decision(
 ) -> GameStateOut:
     _require_admin(db, authorization)
     auction_id = _require_auction_id(auction_id)
-    state = _ensure_game_state(db, auction_id)
-    if not state.current_player_id:
-        raise HTTPException(status_code=400, detail="No active player")
-
-    player = db.get(Player, state.current_player_id)
-    if not player:
-        raise HTTPException(status_code=404, detail="Player not found")
-
-    if payload.action == "sold":
-        if not state.high_bidder_id:
-            raise HTTPException(status_code=400, detail="No high bidder")
-        team = db.get(Team, state.high_bidder_id)
-        if not team:
-            raise HTTPException(status_code=404, detail="Team not found")
-        if _roster_count(db, team.id) >= 4:
-            raise HTTPException(status_code=400, detail="Roster is full")
-        player.status = "sold"
-        player.sold_to_team_id = team.id
-        player.sold_price = state.current_bid
-        team.points -= state.current_bid
-        _log(db, auction_id, f"SOLD {player.name} to {team.name} for {state.current_bid}")
-    else:
-        player.status = "unsold"
-        _log(db, auction_id, f"PASS {player.name}")
-
-    state.current_bid = 0
-    state.high_bidder_id = None
-    state.last_bid_team_id = None
-    state.timer_value = DEFAULT_TIMER
-    state.is_timer_running = True
-
-    team_count = db.query(Team).filter(Team.auction_id == auction_id).count()
-    sold_count = (
-        db.query(Player)
-        .filter(Player.auction_id == auction_id, Player.status == "sold")
-        .count()
-    )
-    max_picks = team_count * 4
-    if team_count > 0 and sold_count >= max_picks:
-        state.current_player_id = None
-        state.phase = "ENDED"
-        state.is_timer_running = False
-        timer_stop_event.set()
-        auction = db.get(Auction, auction_id)
-        if auction:
-            auction.status = "ENDED"
-    else:
-        next_player = db.scalars(
-            select(Player)
-            .where(Player.auction_id == auction_id, Player.status == "waiting")
-            .order_by(Player.order_index)
-        ).first()
-        if next_player:
-            next_player.status = "bidding"
-            state.current_player_id = next_player.id
-        else:
-            unsold_players = db.scalars(
-                select(Player)
-                .where(Player.auction_id == auction_id, Player.status == "unsold")
-                .order_by(Player.order_index)
-            ).all()
-            if unsold_players:
-                for player_item in unsold_players:
-                    player_item.status = "waiting"
-                next_unsold = unsold_players[0]
-                next_unsold.status = "bidding"
-                state.current_player_id = next_unsold.id
-                state.phase = "AUCTION"
-                _log(db, auction_id, "UNSOLD REQUEUE")
-            else:
-                state.current_player_id = None
-                state.phase = "ENDED"
-                auction = db.get(Auction, auction_id)
-                if auction:
-                    auction.status = "ENDED"
-
-    db.commit()
-    _start_timer_thread()
-    logs = db.scalars(
-        select(BidLog)
-        .where(BidLog.auction_id == auction_id)
-        .order_by(BidLog.id.desc())
-        .limit(50)
-    ).all()
-    history = [log.message for log in logs]
-    db.refresh(state)
-    _broadcast_for_auction(
-        auction_id,
-        "round_end",
-        {
-            "result": payload.action,
-            "player": _player_to_out(player).model_dump(by_alias=True),
-            "price": player.sold_price,
-            "teamId": player.sold_to_team_id,
-        },
-    )
-    if state.current_player_id:
-        next_player = db.get(Player, state.current_player_id)
-        if next_player:
-            _broadcast_for_auction(
-                auction_id,
-                "new_round",
-                {
-                    "player": _player_to_out(next_player).model_dump(by_alias=True),
-                    "endTime": time.time() + state.timer_value,
-                },
-            )
-    _broadcast("lobby_update", _lobby_payload(db, auction_id))
-    return _state_to_out(state, history)
+    return _settle_round(auction_id, payload.action)
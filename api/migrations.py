@@ -0,0 +1,199 @@
+from __future__ import annotations
+
+import logging
+from typing import Callable
+
+from sqlalchemy import (
+    Column,
+    Engine,
+    Integer,
+    MetaData,
+    Table,
+    bindparam,
+    inspect,
+    select,
+    text,
+    update,
+)
+from sqlalchemy.engine import Connection
+
+try:
+    from .db import Base
+    from .models import BidLog, GameState, LobbyVersion, Player, TimerLease, player_dedupe_key
+    from .ranking import RATING_COLUMNS, player_ratings
+except ImportError:  # Allows running from api folder.
+    from db import Base
+    from models import BidLog, GameState, LobbyVersion, Player, TimerLease, player_dedupe_key
+    from ranking import RATING_COLUMNS, player_ratings
+
+logger = logging.getLogger(__name__)
+
+_meta = MetaData()
+schema_version = Table(
+    "schema_version",
+    _meta,
+    Column("id", Integer, primary_key=True),
+    Column("version", Integer, nullable=False),
+)
+SCHEMA_VERSION_ID = 1
+# Any constant shared by every process; names the Postgres advisory lock.
+MIGRATION_LOCK_KEY = 7_340_213
+
+
+def _add_column(conn: Connection, table: str, name: str, ddl: str) -> None:
+    columns = {column["name"] for column in inspect(conn).get_columns(table)}
+    if name not in columns:
+        conn.execute(text(f"ALTER TABLE {table} ADD COLUMN {name} {ddl}"))
+
+
+def _create_tables(conn: Connection) -> None:
+    Base.metadata.create_all(bind=conn)
+
+
+def _game_state_columns(conn: Connection) -> None:
+    _add_column(conn, GameState.__tablename__, "last_bid_team_id", "VARCHAR REFERENCES teams(id)")
+    _add_column(conn, GameState.__tablename__, "version", "INTEGER NOT NULL DEFAULT 0")
+    _add_column(conn, GameState.__tablename__, "auto_hammer", "BOOLEAN DEFAULT 0")
+
+
+def _hot_query_indexes(conn: Connection) -> None:
+    for table in (Player.__table__, BidLog.__table__):
+        columns = {column["name"] for column in inspect(conn).get_columns(table.name)}
+        for index in table.indexes:
+            # Unique indexes need their columns backfilled first, and indexes
+            # on columns added by a later step are created by that step.
+            if not index.unique and {column.name for column in index.columns} <= columns:
+                index.create(bind=conn, checkfirst=True)
+
+
+def _timer_leases(conn: Connection) -> None:
+    TimerLease.__table__.create(bind=conn, checkfirst=True)
+
+
+def _lobby_versions(conn: Connection) -> None:
+    LobbyVersion.__table__.create(bind=conn, checkfirst=True)
+
+
+def _player_dedupe_keys(conn: Connection) -> None:
+    _add_column(conn, Player.__tablename__, "dedupe_key", "VARCHAR")
+    players = Player.__table__
+    rows = conn.execute(
+        select(
+            players.c.id,
+            players.c.auction_id,
+            players.c.name,
+            players.c.tank_tier,
+            players.c.dps_tier,
+            players.c.supp_tier,
+        )
+        .where(players.c.dedupe_key.is_(None))
+        .order_by(players.c.auction_id, players.c.order_index)
+    )
+    seen: set[tuple[str, str]] = set()
+    keys = []
+    for row in rows:
+        key = player_dedupe_key(row.name, row.tank_tier, row.dps_tier, row.supp_tier)
+        # Duplicates left over from edits keep a NULL key rather than
+        # failing the unique index.
+        if (row.auction_id, key) in seen:
+            continue
+        seen.add((row.auction_id, key))
+        keys.append({"row_id": row.id, "key": key})
+    if keys:
+        conn.execute(
+            update(players)
+            .where(players.c.id == bindparam("row_id"))
+            .values(dedupe_key=bindparam("key")),
+            keys,
+        )
+    for index in players.indexes:
+        if index.unique:
+            index.create(bind=conn, checkfirst=True)
+
+
+def _player_ratings(conn: Connection) -> None:
+    for column in RATING_COLUMNS:
+        _add_column(conn, Player.__tablename__, column, "SMALLINT NOT NULL DEFAULT 0")
+    players = Player.__table__
+    rows = conn.execute(
+        select(players.c.id, players.c.tank_tier, players.c.dps_tier, players.c.supp_tier)
+    )
+    ratings = []
+    for row in rows:
+        values = player_ratings(row.tank_tier, row.dps_tier, row.supp_tier)
+        ratings.append({"row_id": row.id, **{f"new_{key}": value for key, value in values.items()}})
+    if ratings:
+        conn.execute(
+            update(players)
+            .where(players.c.id == bindparam("row_id"))
+            .values({column: bindparam(f"new_{column}") for column in RATING_COLUMNS}),
+            ratings,
+        )
+    for index in players.indexes:
+        if "rating" in index.columns:
+            index.create(bind=conn, checkfirst=True)
+
+
+# Append only: each entry runs once, in order, and its position is the
+# schema version recorded after it succeeds.
+MIGRATIONS: list[tuple[str, Callable[[Connection], None]]] = [
+    ("create tables", _create_tables),
+    ("game_state columns", _game_state_columns),
+    ("hot query indexes", _hot_query_indexes),
+    ("timer leases", _timer_leases),
+    ("player dedupe keys", _player_dedupe_keys),
+    ("player tier ratings", _player_ratings),
+    ("lobby versions", _lobby_versions),
+]
+
+
+def _lock(conn: Connection) -> None:
+    # Held until the migration commits, so processes starting together run
+    # the steps one after another instead of racing on the same DDL.
+    if conn.dialect.name == "sqlite":
+        conn.exec_driver_sql("BEGIN IMMEDIATE")
+    elif conn.dialect.name == "postgresql":
+        conn.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": MIGRATION_LOCK_KEY})
+
+
+def current_version(conn: Connection) -> int:
+    inspector = inspect(conn)
+    if inspector.has_table(schema_version.name):
+        columns = {column["name"] for column in inspector.get_columns(schema_version.name)}
+        if "id" not in columns:
+            # Older databases kept bare, possibly repeated, version rows.
+            version = conn.execute(text("SELECT MAX(version) FROM schema_version")).scalar()
+            conn.execute(text("DROP TABLE schema_version"))
+            schema_version.create(bind=conn)
+            conn.execute(schema_version.insert().values(id=SCHEMA_VERSION_ID, version=version or 0))
+            return version or 0
+    schema_version.create(bind=conn, checkfirst=True)
+    version = conn.execute(
+        select(schema_version.c.version).where(schema_version.c.id == SCHEMA_VERSION_ID)
+    ).scalar()
+    if version is None:
+        conn.execute(schema_version.insert().values(id=SCHEMA_VERSION_ID, version=0))
+        return 0
+    return version
+
+
+def migrate(engine: Engine) -> int:
+    applied = []
+    with engine.connect() as conn:
+        _lock(conn)
+        version = current_version(conn)
+        for number, (name, step) in enumerate(MIGRATIONS, start=1):
+            if number <= version:
+                continue
+            step(conn)
+            conn.execute(
+                schema_version.update()
+                .where(schema_version.c.id == SCHEMA_VERSION_ID)
+                .values(version=number)
+            )
+            applied.append((number, name))
+            version = number
+        conn.commit()
+    for number, name in applied:
+        logger.info("Applied migration %s: %s", number, name)
+    return version
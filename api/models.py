@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from datetime import datetime
-from sqlalchemy import Boolean, DateTime, Float, ForeignKey, Integer, String
+from sqlalchemy import Boolean, DateTime, Float, ForeignKey, Index, Integer, SmallInteger, String
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 try:
@@ -48,13 +48,30 @@ class Player(Base):
     supp_tier: Mapped[str] = mapped_column(String, nullable=False)
     status: Mapped[str] = mapped_column(String, default="waiting")
     sold_to_team_id: Mapped[str | None] = mapped_column(
-        String, ForeignKey("teams.id"), nullable=True
+        String, ForeignKey("teams.id"), nullable=True, index=True
     )
     sold_price: Mapped[int | None] = mapped_column(Integer, nullable=True)
     order_index: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    dedupe_key: Mapped[str | None] = mapped_column(String, nullable=True)
+    # Numeric tier ratings (ranking.player_ratings); rating is the best role.
+    tank_rating: Mapped[int] = mapped_column(SmallInteger, nullable=False, default=0)
+    dps_rating: Mapped[int] = mapped_column(SmallInteger, nullable=False, default=0)
+    supp_rating: Mapped[int] = mapped_column(SmallInteger, nullable=False, default=0)
+    rating: Mapped[int] = mapped_column(SmallInteger, nullable=False, default=0)
 
     sold_to_team: Mapped["Team | None"] = relationship(back_populates="roster")
 
+    __table_args__ = (
+        Index("ix_players_auction_status_order", "auction_id", "status", "order_index"),
+        Index("ux_players_auction_dedupe_key", "auction_id", "dedupe_key", unique=True),
+        Index("ix_players_auction_rating", "auction_id", "rating"),
+    )
+
+
+def player_dedupe_key(name: str | None, tank: str | None, dps: str | None, supp: str | None) -> str:
+    # Case and surrounding whitespace are ignored when matching players.
+    return "\x1f".join((value or "").strip().lower() for value in (name, tank, dps, supp))
+
 
 class GameState(Base):
     __tablename__ = "game_state"
@@ -75,6 +92,10 @@ class GameState(Base):
     last_bid_team_id: Mapped[str | None] = mapped_column(
         String, ForeignKey("teams.id"), nullable=True
     )
+    auto_hammer: Mapped[bool] = mapped_column(Boolean, default=False)
+    version: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+
+    __mapper_args__ = {"version_id_col": version}
 
     current_player: Mapped["Player | None"] = relationship(
         foreign_keys=[current_player_id], lazy="selectin"
@@ -92,9 +113,26 @@ class BidLog(Base):
     message: Mapped[str] = mapped_column(String, nullable=False)
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
 
+    __table_args__ = (Index("ix_bid_logs_auction_id_id", "auction_id", "id"),)
+
 
 class AdminSession(Base):
     __tablename__ = "admin_sessions"
 
     token: Mapped[str] = mapped_column(String, primary_key=True)
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+
+
+class LobbyVersion(Base):
+    __tablename__ = "lobby_versions"
+
+    auction_id: Mapped[str] = mapped_column(String, ForeignKey("auctions.id"), primary_key=True)
+    version: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+
+
+class TimerLease(Base):
+    __tablename__ = "timer_leases"
+
+    auction_id: Mapped[str] = mapped_column(String, ForeignKey("auctions.id"), primary_key=True)
+    owner: Mapped[str] = mapped_column(String, nullable=False)
+    expires_at: Mapped[datetime] = mapped_column(DateTime, nullable=False)
@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+import sys
+
+from sqlalchemy import Engine, create_engine, select, text
+from sqlalchemy.sql import Select
+
+try:
+    from .migrations import migrate
+    from .models import BidLog, Player, Team
+except ImportError:  # Allows running from api folder.
+    from migrations import migrate
+    from models import BidLog, Player, Team
+
+AUCTION = "auction"
+
+
+# Mirrors the per-request and runtime-load queries issued by main.py
+# (_load_draft, _load_runtime, ...); keep it in step when they change.
+HOT_QUERIES: dict[str, Select] = {
+    "players by auction": select(Player)
+    .where(Player.auction_id == AUCTION)
+    .order_by(Player.order_index.is_(None), Player.order_index),
+    "draft pool": select(Player).where(Player.auction_id == AUCTION),
+    "team seats": select(Team.id, Team.name, Team.points).where(Team.auction_id == AUCTION),
+    "player by dedupe key": select(Player.id).where(
+        Player.auction_id == AUCTION, Player.dedupe_key == "key"
+    ),
+    "players by rating": select(Player)
+    .where(Player.auction_id == AUCTION)
+    .order_by(Player.rating.desc()),
+    "team roster": select(Player).where(Player.sold_to_team_id.in_(["team"])),
+    "teams by auction": select(Team).where(Team.auction_id == AUCTION),
+    "recent logs": select(BidLog.message)
+    .where(BidLog.auction_id == AUCTION)
+    .order_by(BidLog.id.desc())
+    .limit(50),
+    "log page": select(BidLog)
+    .where(BidLog.auction_id == AUCTION, BidLog.id < 100)
+    .order_by(BidLog.id.desc())
+    .limit(100),
+}
+
+
+def full_scans(engine: Engine) -> dict[str, list[str]]:
+    found: dict[str, list[str]] = {}
+    with engine.connect() as conn:
+        for name, query in HOT_QUERIES.items():
+            compiled = query.compile(engine, compile_kwargs={"literal_binds": True})
+            plan = conn.execute(text(f"EXPLAIN QUERY PLAN {compiled}")).all()
+            scans = [row[-1] for row in plan if row[-1].startswith("SCAN ")]
+            if scans:
+                found[name] = scans
+    return found
+
+
+def main() -> int:
+    engine = create_engine("sqlite://")
+    migrate(engine)
+    found = full_scans(engine)
+    for name, scans in found.items():
+        print(f"{name}: {'; '.join(scans)}")
+    if not found:
+        print(f"{len(HOT_QUERIES)} hot queries use indexes")
+    return 1 if found else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+import re
+from array import array
+from functools import lru_cache
+from typing import Sequence
+
+try:
+    from .tiers import TIER_PREFIXES
+except ImportError:  # Allows running from api folder.
+    from tiers import TIER_PREFIXES
+
+# Weakest to strongest; a rank spans DIVISIONS ratings, division 1 on top.
+RANKS = ("브", "실", "골", "플", "다", "마", "챔", "그마")
+DIVISIONS = 5
+TIER_ORDERS = ("snake", "interleave", "strongest")
+RATING_COLUMNS = ("tank_rating", "dps_rating", "supp_rating", "rating")
+
+_RANK_INDEX = {rank: index for index, rank in enumerate(RANKS)}
+_TIER = re.compile(
+    "({})\\s*(\\d*)".format("|".join(re.escape(prefix) for prefix in TIER_PREFIXES))
+)
+
+
+@lru_cache(maxsize=1024)
+def tier_rating(tier: str | None) -> int:
+    # 0 for N/A or anything unrecognised, otherwise 1 (브5) to 40 (그마1).
+    match = _TIER.fullmatch((tier or "").strip())
+    if match is None:
+        return 0
+    prefix, number = match.groups()
+    division = min(max(int(number), 1), DIVISIONS) if number else DIVISIONS
+    return _RANK_INDEX[TIER_PREFIXES[prefix]] * DIVISIONS + DIVISIONS - division + 1
+
+
+def player_ratings(tank: str | None, dps: str | None, supp: str | None) -> dict[str, int]:
+    ratings = {
+        "tank_rating": tier_rating(tank),
+        "dps_rating": tier_rating(dps),
+        "supp_rating": tier_rating(supp),
+    }
+    ratings["rating"] = max(ratings.values())
+    return ratings
+
+
+class RatingTable:
+    """Per-role ratings of a player pool, one compact array per role."""
+
+    def __init__(self, tank: Sequence[int], dps: Sequence[int], supp: Sequence[int]) -> None:
+        self.roles = (array("B", tank), array("B", dps), array("B", supp))
+        self.best = array("B", map(max, *self.roles))
+        self.total = array("H", map(sum, zip(*self.roles)))
+
+    def __len__(self) -> int:
+        return len(self.best)
+
+    def strongest(self) -> list[int]:
+        # Best role first, then overall depth; ties keep the incoming order.
+        best, total = self.best, self.total
+        return sorted(range(len(best)), key=lambda index: (-best[index], -total[index]))
+
+    def best_role(self, index: int) -> int:
+        ratings = [role[index] for role in self.roles]
+        return ratings.index(max(ratings))
+
+    def snake(self, pot_size: int) -> list[int]:
+        # Pots of pot_size players of similar strength, alternating between
+        # strongest-first and weakest-first so prices rise and fall in turn.
+        ranked = self.strongest()
+        pot_size = max(pot_size, 1)
+        order: list[int] = []
+        for number, start in enumerate(range(0, len(ranked), pot_size)):
+            pot = ranked[start : start + pot_size]
+            order.extend(reversed(pot) if number % 2 else pot)
+        return order
+
+    def interleave(self) -> list[int]:
+        # Round robin over tank, dps and support, each queue strongest-first
+        # by the player's best role; an empty queue drops out of the rotation.
+        queues: list[list[int]] = [[], [], []]
+        for index in reversed(self.strongest()):
+            queues[self.best_role(index)].append(index)
+        order: list[int] = []
+        while any(queues):
+            for queue in queues:
+                if queue:
+                    order.append(queue.pop())
+        return order
+
+    def order(self, strategy: str, pot_size: int) -> list[int]:
+        if strategy == "snake":
+            return self.snake(pot_size)
+        if strategy == "interleave":
+            return self.interleave()
+        if strategy == "strongest":
+            return self.strongest()
+        raise ValueError(f"Unknown tier order: {strategy}")
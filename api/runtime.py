@@ -0,0 +1,415 @@
+from __future__ import annotations
+
+import logging
+import threading
+from collections import Counter, deque
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Callable, Iterable, Iterator
+
+from sqlalchemy import insert, update
+from sqlalchemy.orm import Session
+
+try:
+    from .db import Base
+    from .models import BidLog, GameState
+except ImportError:  # Allows running from api folder.
+    from db import Base
+    from models import BidLog, GameState
+
+logger = logging.getLogger(__name__)
+
+MAX_ROSTER = 4
+
+
+class BidRejected(Exception):
+    def __init__(self, status_code: int, detail: str | dict) -> None:
+        super().__init__(detail)
+        self.status_code = status_code
+        self.detail = detail
+
+
+class Outbid(BidRejected):
+    def __init__(self, current_bid: int, retry_at: int, version: int) -> None:
+        super().__init__(
+            409,
+            {
+                "code": "outbid",
+                "message": f"Outbid, retry at {retry_at}",
+                "currentBid": current_bid,
+                "retryAt": retry_at,
+                "version": version,
+            },
+        )
+
+
+@dataclass
+class TeamSeat:
+    id: str
+    name: str
+    points: int
+    roster_count: int
+
+
+@dataclass
+class DraftQueue:
+    players: dict[str, dict]
+    upcoming: deque[str] = field(default_factory=deque)
+    unsold: list[str] = field(default_factory=list)
+    sold_count: int = 0
+
+    @classmethod
+    def build(cls, players: Iterable[dict], current_id: str | None = None) -> DraftQueue:
+        ordered = sorted(players, key=_order_key)
+        draft = cls(players={player["id"]: player for player in ordered})
+        for player in ordered:
+            if player["id"] == current_id:
+                continue
+            if player["status"] == "waiting":
+                draft.upcoming.append(player["id"])
+            elif player["status"] == "unsold":
+                draft.unsold.append(player["id"])
+            elif player["status"] == "sold":
+                draft.sold_count += 1
+        return draft
+
+    def roster_counts(self) -> Counter[str]:
+        return Counter(
+            player["soldToTeamId"] for player in self.players.values() if player["soldToTeamId"]
+        )
+
+    def update(self, player_id: str, **values: Any) -> dict:
+        player = {**self.players[player_id], **values}
+        self.players[player_id] = player
+        return player
+
+    def requeue_unsold(self) -> list[dict]:
+        self.unsold.sort(key=lambda player_id: _order_key(self.players[player_id]))
+        self.upcoming.extend(self.unsold)
+        requeued = [self.update(player_id, status="waiting") for player_id in self.unsold]
+        self.unsold.clear()
+        return requeued
+
+    def pop_next(self) -> dict | None:
+        if not self.upcoming:
+            return None
+        return self.update(self.upcoming.popleft(), status="bidding")
+
+
+def _order_key(player: dict) -> int:
+    order_index = player.get("orderIndex")
+    return order_index if order_index is not None else 0
+
+
+@dataclass
+class RoundResult:
+    action: str
+    player: dict
+    team: TeamSeat | None
+    price: int | None
+    next_player: dict | None
+    changed: list[dict]
+    logs: list[str]
+
+
+@dataclass
+class AuctionRuntime:
+    auction_id: str
+    phase: str
+    current_player: dict | None
+    current_bid: int
+    high_bidder_id: str | None
+    last_bid_team_id: str | None
+    timer_value: float
+    is_timer_running: bool
+    version: int
+    teams: dict[str, TeamSeat]
+    draft: DraftQueue
+    auto_hammer: bool = False
+
+    def validate_bid(
+        self,
+        team_id: str,
+        amount: int,
+        bidding_open: bool,
+        expected_version: int | None = None,
+    ) -> tuple[TeamSeat, int]:
+        team = self.teams.get(team_id)
+        if team is None:
+            raise BidRejected(404, "Team not found")
+        if not bidding_open:
+            raise BidRejected(400, "Bidding is closed")
+        if self.last_bid_team_id == team.id:
+            raise BidRejected(400, "Consecutive bid not allowed")
+        if team.roster_count >= MAX_ROSTER:
+            raise BidRejected(400, "Roster is full")
+        if amount <= 0:
+            raise BidRejected(400, "Invalid bid amount")
+        new_bid = self.current_bid + amount
+        if expected_version is not None and expected_version != self.version:
+            raise Outbid(self.current_bid, new_bid, self.version)
+        if new_bid > team.points:
+            raise BidRejected(400, "Not enough points")
+        return team, new_bid
+
+    def apply_bid(self, team: TeamSeat, new_bid: int, timer_value: float) -> str:
+        self.current_bid = new_bid
+        self.high_bidder_id = team.id
+        self.last_bid_team_id = team.id
+        self.timer_value = timer_value
+        self.is_timer_running = True
+        self.version += 1
+        return f"{team.name} bid {new_bid}"
+
+    def settle(self, action: str, timer_value: float) -> RoundResult:
+        if self.current_player is None:
+            raise BidRejected(400, "No active player")
+        draft = self.draft
+        player_id = self.current_player["id"]
+        team = None
+        price = None
+        if action == "sold":
+            team = self.teams.get(self.high_bidder_id or "")
+            if team is None:
+                raise BidRejected(400, "No high bidder")
+            if team.roster_count >= MAX_ROSTER:
+                raise BidRejected(400, "Roster is full")
+            price = self.current_bid
+            player = draft.update(player_id, status="sold", soldToTeamId=team.id, soldPrice=price)
+            team.points -= price
+            team.roster_count += 1
+            draft.sold_count += 1
+            logs = [f"SOLD {player['name']} to {team.name} for {price}"]
+        else:
+            player = draft.update(player_id, status="unsold")
+            draft.unsold.append(player_id)
+            logs = [f"PASS {player['name']}"]
+
+        changed = [player]
+        next_player = None
+        if not self.teams or draft.sold_count < len(self.teams) * MAX_ROSTER:
+            if not draft.upcoming and draft.unsold:
+                changed.extend(draft.requeue_unsold())
+                logs.append("UNSOLD REQUEUE")
+            next_player = draft.pop_next()
+            if next_player is not None:
+                changed.append(next_player)
+
+        self.current_player = next_player
+        self.current_bid = 0
+        self.high_bidder_id = None
+        self.last_bid_team_id = None
+        self.timer_value = timer_value
+        self.is_timer_running = next_player is not None
+        self.phase = "AUCTION" if next_player is not None else "ENDED"
+        self.version += 1
+        return RoundResult(
+            action=action,
+            player=player,
+            team=team,
+            price=price,
+            next_player=next_player,
+            changed=list({item["id"]: item for item in changed}.values()),
+            logs=logs,
+        )
+
+    def state_fields(self) -> dict[str, Any]:
+        return {
+            "phase": self.phase,
+            "current_player_id": self.current_player["id"] if self.current_player else None,
+            "current_bid": self.current_bid,
+            "high_bidder_id": self.high_bidder_id,
+            "last_bid_team_id": self.last_bid_team_id,
+            "timer_value": self.timer_value,
+            "is_timer_running": self.is_timer_running,
+            "version": self.version,
+        }
+
+
+@dataclass
+class _Pending:
+    fields: dict[str, Any] = field(default_factory=dict)
+    logs: list[dict[str, Any]] = field(default_factory=list)
+    rows: list[tuple[type[Base], str, dict[str, Any]]] = field(default_factory=list)
+
+
+class WriteBehind:
+    def __init__(self, session_factory: Callable[[], Session], interval: float = 0.05) -> None:
+        self.session_factory = session_factory
+        self.interval = interval
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._pending: dict[str, _Pending] = {}
+        self._conflicts: set[str] = set()
+        self._wakeup = threading.Event()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> None:
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._wakeup.set()
+        if self._thread:
+            self._thread.join()
+        self.flush()
+
+    def record(
+        self,
+        auction_id: str,
+        fields: dict[str, Any] | None = None,
+        log: str | None = None,
+        rows: list[tuple[type[Base], str, dict[str, Any]]] | None = None,
+    ) -> None:
+        with self._lock:
+            pending = self._pending.setdefault(auction_id, _Pending())
+            if fields:
+                pending.fields.update(fields)
+            if rows:
+                pending.rows.extend(rows)
+            if log is not None:
+                pending.logs.append(
+                    {"auction_id": auction_id, "message": log, "created_at": datetime.utcnow()}
+                )
+        self._wakeup.set()
+
+    def flush(self, auction_id: str | None = None) -> None:
+        # Batches are taken and written under one lock so they reach the
+        # database in the order they were recorded. A batch that lost to a
+        # newer version written by another process is discarded and its
+        # auction kept in the conflicts until take_conflict() collects it.
+        conflicts: set[str] = set()
+        with self._flush_lock:
+            with self._lock:
+                if auction_id is None:
+                    batches, self._pending = self._pending, {}
+                else:
+                    batch = self._pending.pop(auction_id, None)
+                    batches = {auction_id: batch} if batch else {}
+            if not batches:
+                return
+            db = self.session_factory()
+            try:
+                for key, batch in batches.items():
+                    if batch.fields:
+                        query = update(GameState).where(GameState.auction_id == key)
+                        version = batch.fields.get("version")
+                        if version is not None:
+                            # Never let a stale batch overwrite a newer state.
+                            query = query.where(GameState.version < version)
+                        result = db.execute(query.values(**batch.fields))
+                        if version is not None and result.rowcount == 0:
+                            conflicts.add(key)
+                            continue
+                    if batch.logs:
+                        db.execute(insert(BidLog), batch.logs)
+                    for model, row_id, values in batch.rows:
+                        db.execute(update(model).where(model.id == row_id).values(**values))
+                db.commit()
+            except Exception:
+                db.rollback()
+                self._requeue(batches)
+                raise
+            finally:
+                db.close()
+        if conflicts:
+            logger.warning("Discarded stale writes for %s", ", ".join(sorted(conflicts)))
+            with self._lock:
+                self._conflicts |= conflicts
+
+    def take_conflict(self, auction_id: str) -> bool:
+        with self._lock:
+            if auction_id not in self._conflicts:
+                return False
+            self._conflicts.discard(auction_id)
+            return True
+
+    def _requeue(self, batches: dict[str, _Pending]) -> None:
+        with self._lock:
+            for key, batch in batches.items():
+                newer = self._pending.get(key)
+                if newer is not None:
+                    batch.fields.update(newer.fields)
+                    batch.logs.extend(newer.logs)
+                    batch.rows.extend(newer.rows)
+                self._pending[key] = batch
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            self._wakeup.wait()
+            self._wakeup.clear()
+            self._stop.wait(self.interval)
+            try:
+                self.flush()
+            except Exception:
+                self._wakeup.set()
+
+
+class RuntimeRegistry:
+    def __init__(
+        self,
+        loader: Callable[[str, DraftQueue | None], AuctionRuntime],
+        writer: WriteBehind,
+    ) -> None:
+        self.loader = loader
+        self.writer = writer
+        self._lock = threading.Lock()
+        self._locks: dict[str, threading.RLock] = {}
+        self._runtimes: dict[str, AuctionRuntime] = {}
+        # Draft queues outlive runtime reloads; they are only rebuilt from
+        # the database when the player pool is edited directly.
+        self._drafts: dict[str, DraftQueue] = {}
+        self._team_auctions: dict[str, str] = {}
+
+    def lock(self, auction_id: str) -> threading.RLock:
+        with self._lock:
+            return self._locks.setdefault(auction_id, threading.RLock())
+
+    def team_auction(self, team_id: str) -> str | None:
+        with self._lock:
+            return self._team_auctions.get(team_id)
+
+    def loaded(self, auction_id: str) -> bool:
+        with self._lock:
+            return auction_id in self._runtimes
+
+    def get(self, auction_id: str) -> AuctionRuntime:
+        with self.lock(auction_id):
+            runtime = self._runtimes.get(auction_id)
+            if runtime is None:
+                self.writer.flush(auction_id)
+                runtime = self.loader(auction_id, self._drafts.get(auction_id))
+                with self._lock:
+                    self._runtimes[auction_id] = runtime
+                    self._drafts[auction_id] = runtime.draft
+                    for team_id in runtime.teams:
+                        self._team_auctions[team_id] = auction_id
+            return runtime
+
+    def install_draft(self, auction_id: str, draft: DraftQueue) -> None:
+        with self.lock(auction_id):
+            with self._lock:
+                self._drafts[auction_id] = draft
+                self._runtimes.pop(auction_id, None)
+
+    def invalidate(self, auction_id: str, draft: bool = False) -> None:
+        with self.lock(auction_id):
+            with self._lock:
+                self._runtimes.pop(auction_id, None)
+                if draft:
+                    self._drafts.pop(auction_id, None)
+
+    @contextmanager
+    def exclusive(self, auction_id: str) -> Iterator[None]:
+        with self.lock(auction_id):
+            self.writer.flush(auction_id)
+            try:
+                yield
+            finally:
+                self.invalidate(auction_id)
@@ -44,6 +44,18 @@ class PlayerOut(PlayerBase):
         from_attributes = True
 
 
+class PlayerImportError(BaseSchema):
+    line: int
+    detail: str
+
+
+class PlayerImportResult(BaseSchema):
+    received: int
+    inserted: int
+    duplicates: int
+    errors: list[PlayerImportError] = Field(default_factory=list)
+
+
 class TeamBase(BaseSchema):
     name: str
     captain_name: str = Field(..., alias="captainName")
@@ -87,13 +99,17 @@ class GameStateOut(BaseSchema):
     high_bidder: Optional[TeamSlim] = Field(default=None, alias="highBidder")
     timer_value: float = Field(..., alias="timerValue")
     is_timer_running: bool = Field(..., alias="isTimerRunning")
+    ends_at: float | None = Field(default=None, alias="endsAt")
     bid_history: list[str] = Field(default_factory=list, alias="bidHistory")
+    auto_hammer: bool = Field(default=False, alias="autoHammer")
+    version: int = 0
 
     class Config:
         from_attributes = True
 
 
 class BidLogOut(BaseSchema):
+    id: int
     message: str
     created_at: str
 
@@ -109,13 +125,19 @@ class JoinLobbyRequest(BaseSchema):
 
 
 class StartGameRequest(BaseSchema):
-    player_list: list[PlayerCreate] = Field(..., alias="playerList")
-    order_type: Literal["seq", "rand"] = Field(..., alias="orderType")
+    # Omitted: draft the players already registered for the auction.
+    player_list: list[PlayerCreate] | None = Field(default=None, alias="playerList")
+    order_type: Literal["seq", "rand", "snake", "interleave", "strongest"] = Field(
+        ..., alias="orderType"
+    )
+    seed: int | None = None
+    auto_hammer: bool | None = Field(default=None, alias="autoHammer")
 
 
 class BidRequest(BaseSchema):
     team_id: str = Field(..., alias="teamId")
     amount: int
+    expected_version: int | None = Field(default=None, alias="expectedVersion")
 
 
 class AdminTimerRequest(BaseSchema):
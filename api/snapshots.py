@@ -0,0 +1,34 @@
+from __future__ import annotations
+
+import threading
+from typing import Callable, Generic, Hashable, TypeVar
+
+T = TypeVar("T")
+
+
+class SnapshotCache(Generic[T]):
+    def __init__(self, build: Callable[[str], T]) -> None:
+        self.build = build
+        self._lock = threading.Lock()
+        self._build_locks: dict[str, threading.Lock] = {}
+        self._snapshots: dict[str, tuple[Hashable, T]] = {}
+
+    def cached(self, auction_id: str, key: Hashable) -> T | None:
+        with self._lock:
+            entry = self._snapshots.get(auction_id)
+        if entry is None or entry[0] != key:
+            return None
+        return entry[1]
+
+    def get(self, auction_id: str, key: Hashable) -> T:
+        # Concurrent misses for one auction wait for the first builder
+        # instead of each running the same queries.
+        with self._lock:
+            build_lock = self._build_locks.setdefault(auction_id, threading.Lock())
+        with build_lock:
+            snapshot = self.cached(auction_id, key)
+            if snapshot is None:
+                snapshot = self.build(auction_id)
+                with self._lock:
+                    self._snapshots[auction_id] = (key, snapshot)
+            return snapshot
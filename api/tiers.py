@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+import re
+from typing import Iterable, Iterator
+
+# Spellings accepted for each tier, in the order they are tried: a longer
+# spelling must come before any shorter one it starts with.
+TIER_PREFIXES = {
+    "그랜드마스터": "그마",
+    "그마": "그마",
+    "그": "그마",
+    "챔피언": "챔",
+    "챔": "챔",
+    "마스터": "마",
+    "마": "마",
+    "다이아": "다",
+    "다야": "다",
+    "다": "다",
+    "플레티넘": "플",
+    "플레": "플",
+    "플": "플",
+    "골드": "골",
+    "골": "골",
+    "실버": "실",
+    "실": "실",
+    "브론즈": "브",
+    "브": "브",
+}
+ROLES = ("탱", "딜", "힐")
+NO_TIER = "N/A"
+
+
+def _trie(words: Iterable[str]) -> str:
+    # Shares common prefixes ("플(?:레(?:티(?:넘))?)?") so the scanner tests each
+    # character once, and keeps longer spellings ahead of shorter ones.
+    branches: dict[str, list[str]] = {}
+    for word in words:
+        branches.setdefault(word[0], []).append(word[1:])
+    parts = []
+    for head, tails in branches.items():
+        rest = [tail for tail in tails if tail]
+        if not rest:
+            parts.append(re.escape(head))
+            continue
+        optional = "?" if len(rest) < len(tails) else ""
+        parts.append(f"{re.escape(head)}(?:{_trie(rest)}){optional}")
+    return "|".join(parts)
+
+
+_RANK = _trie(TIER_PREFIXES)
+_ROLE = _trie(ROLES)
+# One scan per line yields rank tokens, role tokens and "X" placeholders
+# (an X at the start of a word); every branch opens with a literal so the
+# scanner can skip ahead to candidate characters.
+_TOKENS = re.compile(rf"({_RANK})\s*(\d+)|({_ROLE})\s*(\d+)|[Xx](?<!\S[Xx])\b")
+_TIER_TEXT = re.compile(rf"(?:{_RANK})\s*\d+|(?:{_ROLE})\s*\d+")
+
+
+def _separate(text: str) -> str:
+    text = text.replace(",", " ").replace("/", " ")
+    return text.replace("탱", " 탱").replace("딜", " 딜").replace("힐", " 힐")
+
+
+def _tier(prefix: str, number: str) -> str:
+    return f"{TIER_PREFIXES.get(prefix, prefix)}{number}"
+
+
+def extract_tiers(text: str) -> tuple[str, str, str]:
+    ranks: list[tuple[str, str]] = []
+    roles: list[tuple[str, str]] = []
+    symbols = 0
+    for match in _TOKENS.finditer(_separate(text)):
+        prefix, number, role, role_number = match.groups()
+        if prefix is not None:
+            ranks.append((prefix, number))
+        elif role is not None:
+            roles.append((role, role_number))
+        else:
+            symbols += 1
+
+    if len(ranks) >= 3:
+        return _tier(*ranks[0]), _tier(*ranks[1]), _tier(*ranks[2])
+
+    if roles:
+        base_prefix = TIER_PREFIXES.get(ranks[0][0], ranks[0][0]) if ranks else ""
+        tiers = dict.fromkeys(ROLES, NO_TIER)
+        for role, number in roles:
+            tiers[role] = f"{base_prefix}{number}" if base_prefix else NO_TIER
+        return tiers["탱"], tiers["딜"], tiers["힐"]
+
+    if symbols and len(ranks) == 1:
+        return NO_TIER, _tier(*ranks[0]), NO_TIER
+    if symbols and len(ranks) == 2:
+        return NO_TIER, _tier(*ranks[0]), _tier(*ranks[1])
+
+    if len(ranks) == 2:
+        return _tier(*ranks[0]), _tier(*ranks[1]), NO_TIER
+
+    if len(ranks) == 1:
+        rank = _tier(*ranks[0])
+        if "딜" in text:
+            return NO_TIER, rank, NO_TIER
+        if "힐" in text:
+            return NO_TIER, NO_TIER, rank
+        return rank, NO_TIER, NO_TIER
+
+    return NO_TIER, NO_TIER, NO_TIER
+
+
+def parse_players(lines: Iterable[str]) -> Iterator[tuple[str, tuple[str, str, str]]]:
+    # Lines are consumed one at a time, so a large export can be streamed.
+    # A line without tiers names the player whose tiers follow on the next.
+    pending_name: str | None = None
+    for raw in lines:
+        line = raw.strip()
+        if "—" in line:
+            line = line.split("—", 1)[0].strip()
+        if not line:
+            continue
+        name, found = _TIER_TEXT.subn("", line)
+        if not found:
+            pending_name = line
+            continue
+        yield pending_name or name.strip() or "Unknown", extract_tiers(line)
+        pending_name = None
@@ -0,0 +1,164 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, replace
+from typing import Callable, Iterator
+
+
+@dataclass
+class _Clock:
+    remaining: float
+    deadline: float | None = None
+
+    @property
+    def running(self) -> bool:
+        return self.deadline is not None
+
+    def time_left(self, now: float) -> float:
+        if self.deadline is None:
+            return self.remaining
+        return max(0.0, self.deadline - now)
+
+
+class TimerScheduler:
+    def __init__(
+        self,
+        on_tick: Callable[[str, float, bool], None],
+        on_expire: Callable[[str], None],
+        sync_interval: float = 0.0,
+    ) -> None:
+        self.on_tick = on_tick
+        self.on_expire = on_expire
+        self.sync_interval = sync_interval
+        self._lock = threading.Lock()
+        self._clocks: dict[str, _Clock] = {}
+        self._wakeups: dict[str, asyncio.Event] = {}
+        self._tasks: dict[str, asyncio.Task] = {}
+        self._loop: asyncio.AbstractEventLoop | None = None
+
+    def bind(self, loop: asyncio.AbstractEventLoop) -> None:
+        self._loop = loop
+
+    def snapshot(self, auction_id: str) -> tuple[float, bool] | None:
+        with self._lock:
+            clock = self._clocks.get(auction_id)
+            if clock is None:
+                return None
+            return clock.time_left(time.monotonic()), clock.running
+
+    def start(self, auction_id: str, remaining: float) -> float:
+        with self._lock:
+            clock = self._clocks.get(auction_id)
+            if clock is None:
+                clock = self._clocks[auction_id] = _Clock(remaining=remaining)
+            if not clock.running:
+                clock.deadline = time.monotonic() + clock.remaining
+            left = clock.time_left(time.monotonic())
+        self._notify(auction_id)
+        return left
+
+    def pause(self, auction_id: str, fallback: float = 0.0) -> float:
+        with self._lock:
+            clock = self._clocks.setdefault(auction_id, _Clock(remaining=fallback))
+            clock.remaining = clock.time_left(time.monotonic())
+            clock.deadline = None
+            left = clock.remaining
+        self._notify(auction_id)
+        return left
+
+    def reset(self, auction_id: str, value: float) -> float:
+        with self._lock:
+            self._clocks[auction_id] = _Clock(remaining=value)
+        self._notify(auction_id)
+        return value
+
+    def extend(self, auction_id: str, bonus: float, cap: float) -> float | None:
+        with self._lock:
+            clock = self._clocks.get(auction_id)
+            if clock is None or not clock.running:
+                return None
+            now = time.monotonic()
+            left = clock.time_left(now)
+            if left <= 0:
+                return None
+            left = min(cap, left + bonus)
+            clock.deadline = now + left
+        self._notify(auction_id)
+        return left
+
+    @contextmanager
+    def tentative(self, auction_id: str) -> Iterator[None]:
+        # Clock changes made inside are undone if the block raises, e.g. when
+        # the write they belong to is refused.
+        with self._lock:
+            clock = self._clocks.get(auction_id)
+            saved = replace(clock) if clock is not None else None
+        try:
+            yield
+        except BaseException:
+            with self._lock:
+                if saved is None:
+                    self._clocks.pop(auction_id, None)
+                else:
+                    self._clocks[auction_id] = saved
+            self._notify(auction_id)
+            raise
+
+    def mirror(self, auction_id: str, time_left: float, running: bool) -> None:
+        # Follows a clock owned by another process without announcing it.
+        with self._lock:
+            clock = self._clocks[auction_id] = _Clock(remaining=time_left)
+            if running:
+                clock.deadline = time.monotonic() + time_left
+        self._notify(auction_id)
+
+    def _notify(self, auction_id: str) -> None:
+        if self._loop is None or self._loop.is_closed():
+            return
+        self._loop.call_soon_threadsafe(self._wake, auction_id)
+
+    def _wake(self, auction_id: str) -> None:
+        wakeup = self._wakeups.get(auction_id)
+        if wakeup is not None:
+            wakeup.set()
+        task = self._tasks.get(auction_id)
+        if task is None or task.done():
+            with self._lock:
+                clock = self._clocks.get(auction_id)
+                running = clock is not None and clock.running
+            if running:
+                self._wakeups[auction_id] = asyncio.Event()
+                self._tasks[auction_id] = asyncio.create_task(self._run(auction_id))
+
+    async def _run(self, auction_id: str) -> None:
+        wakeup = self._wakeups[auction_id]
+        ticked = False
+        try:
+            while True:
+                with self._lock:
+                    clock = self._clocks.get(auction_id)
+                    if clock is None or not clock.running:
+                        return
+                    left = clock.time_left(time.monotonic())
+                    if left <= 0:
+                        clock.remaining = 0.0
+                        clock.deadline = None
+                if left <= 0:
+                    await asyncio.to_thread(self.on_expire, auction_id)
+                    continue
+                if ticked:
+                    self.on_tick(auction_id, left, True)
+                wakeup.clear()
+                timeout = min(left, self.sync_interval) if self.sync_interval else left
+                try:
+                    await asyncio.wait_for(wakeup.wait(), timeout)
+                    ticked = False
+                except asyncio.TimeoutError:
+                    ticked = bool(self.sync_interval)
+        finally:
+            if self._tasks.get(auction_id) is asyncio.current_task():
+                self._tasks.pop(auction_id, None)
+                self._wakeups.pop(auction_id, None)
@@ -1,45 +1,238 @@
 from __future__ import annotations
 
-from typing import Any
+import asyncio
+import time
+from collections import deque
+from typing import Any, Callable
 
 from fastapi import WebSocket
 
+try:
+    from .codec import Interner, encode_binary, encode_json
+except ImportError:  # Allows running from api folder.
+    from codec import Interner, encode_binary, encode_json
+
+COALESCED_EVENTS = {"timer_sync"}
+# Viewers only need the latest state, so their bursts collapse further.
+VIEWER_COALESCED_EVENTS = COALESCED_EVENTS | {"bid_update", "state_sync"}
+LAGGING_CLOSE_CODE = 1013
+
+
+class ClientConnection:
+    def __init__(
+        self,
+        websocket: WebSocket,
+        key: str,
+        max_queue: int,
+        max_lag: float,
+        on_failure: Callable[[WebSocket], None],
+        binary: bool = False,
+        viewer: bool = False,
+        interval: float = 0.0,
+    ) -> None:
+        self.websocket = websocket
+        self.key = key
+        self.binary = binary
+        self.viewer = viewer
+        self.interval = interval
+        self.known: set[int] = set()
+        self.max_queue = max_queue
+        self.max_lag = max_lag
+        self.on_failure = on_failure
+        self.frames: deque[tuple[str | None, str | bytes, float]] = deque()
+        self.ready = asyncio.Event()
+        self.closed = False
+        self.writer: asyncio.Task | None = None
+
+    def start(self) -> None:
+        self.writer = asyncio.create_task(self._write())
+
+    def push(self, data: str | bytes, coalesce: str | None = None) -> bool:
+        if self.closed:
+            return False
+        now = time.monotonic()
+        if self.frames and now - self.frames[0][2] > self.max_lag:
+            return False
+        if coalesce is not None:
+            for index, frame in enumerate(self.frames):
+                if frame[0] == coalesce:
+                    del self.frames[index]
+                    break
+        if len(self.frames) >= self.max_queue and not self._drop_coalesced():
+            return False
+        self.frames.append((coalesce, data, now))
+        self.ready.set()
+        return True
+
+    def close(self, code: int | None = None) -> None:
+        if self.closed:
+            return
+        self.closed = True
+        self.frames.clear()
+        if self.writer and self.writer is not asyncio.current_task():
+            self.writer.cancel()
+        if code is not None:
+            asyncio.create_task(self._close_socket(code))
+
+    def _drop_coalesced(self) -> bool:
+        for index, frame in enumerate(self.frames):
+            if frame[0] is not None:
+                del self.frames[index]
+                return True
+        return False
+
+    async def _write(self) -> None:
+        try:
+            while True:
+                await self.ready.wait()
+                while self.frames:
+                    _, data, _ = self.frames.popleft()
+                    if isinstance(data, bytes):
+                        await self.websocket.send_bytes(data)
+                    else:
+                        await self.websocket.send_text(data)
+                self.ready.clear()
+                if self.interval:
+                    await asyncio.sleep(self.interval)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            self.on_failure(self.websocket)
+
+    async def _close_socket(self, code: int) -> None:
+        try:
+            await self.websocket.close(code=code)
+        except Exception:
+            pass
+
 
 class ConnectionManager:
-    def __init__(self) -> None:
-        self.active_connections: dict[str, set[WebSocket]] = {}
-        self.connection_index: dict[WebSocket, str] = {}
+    def __init__(
+        self, max_queue: int = 256, max_lag: float = 5.0, viewer_interval: float = 0.25
+    ) -> None:
+        self.max_queue = max_queue
+        self.max_lag = max_lag
+        self.viewer_interval = viewer_interval
+        self.active_connections: dict[str, set[ClientConnection]] = {}
+        self.viewer_connections: dict[str, set[ClientConnection]] = {}
+        self.connection_index: dict[WebSocket, ClientConnection] = {}
+        # One per auction, dropped with its last connection, so ids and names
+        # from finished auctions are not kept for the life of the process.
+        self.interners: dict[str, Interner] = {}
 
-    async def connect(self, websocket: WebSocket, auction_id: str | None) -> None:
+    async def connect(
+        self,
+        websocket: WebSocket,
+        auction_id: str | None,
+        binary: bool = False,
+        viewer: bool = False,
+    ) -> None:
         await websocket.accept()
         key = auction_id or "_global"
-        self.active_connections.setdefault(key, set()).add(websocket)
-        self.connection_index[websocket] = key
-
-    def disconnect(self, websocket: WebSocket) -> None:
-        key = self.connection_index.pop(websocket, None)
-        if key and key in self.active_connections:
-            self.active_connections[key].discard(websocket)
-            if not self.active_connections[key]:
-                self.active_connections.pop(key, None)
-
-    async def broadcast(self, message: dict[str, Any]) -> None:
-        stale: list[WebSocket] = []
-        for connections in list(self.active_connections.values()):
-            for websocket in list(connections):
-                try:
-                    await websocket.send_json(message)
-                except Exception:
-                    stale.append(websocket)
-        for websocket in stale:
-            self.disconnect(websocket)
-
-    async def broadcast_to(self, auction_id: str, message: dict[str, Any]) -> None:
-        stale: list[WebSocket] = []
-        for websocket in list(self.active_connections.get(auction_id, set())):
-            try:
-                await websocket.send_json(message)
-            except Exception:
-                stale.append(websocket)
-        for websocket in stale:
-            self.disconnect(websocket)
+        client = ClientConnection(
+            websocket,
+            key,
+            self.max_queue,
+            self.max_lag,
+            self.disconnect,
+            binary,
+            viewer,
+            self.viewer_interval if viewer else 0.0,
+        )
+        client.start()
+        self._pool(client).setdefault(key, set()).add(client)
+        self.connection_index[websocket] = client
+
+    def is_viewer(self, websocket: WebSocket) -> bool:
+        client = self.connection_index.get(websocket)
+        return client is not None and client.viewer
+
+    def _pool(self, client: ClientConnection) -> dict[str, set[ClientConnection]]:
+        return self.viewer_connections if client.viewer else self.active_connections
+
+    def disconnect(self, websocket: WebSocket, code: int | None = None) -> None:
+        client = self.connection_index.pop(websocket, None)
+        if client is None:
+            return
+        client.close(code)
+        pool = self._pool(client)
+        connections = pool.get(client.key)
+        if connections is not None:
+            connections.discard(client)
+            if not connections:
+                pool.pop(client.key, None)
+        if client.key not in self.active_connections and client.key not in self.viewer_connections:
+            self.interners.pop(client.key, None)
+
+    def send(self, websocket: WebSocket, message: dict[str, Any]) -> None:
+        client = self.connection_index.get(websocket)
+        if client is not None:
+            self._push_all([client], message)
+
+    def send_frame(self, websocket: WebSocket, data: str) -> None:
+        # Pre-serialized JSON, sent as is to binary clients too.
+        client = self.connection_index.get(websocket)
+        if client is not None and not client.push(data):
+            self.disconnect(websocket, LAGGING_CLOSE_CODE)
+
+    def broadcast(self, message: dict[str, Any]) -> None:
+        # Players are queued ahead of viewers so a crowd of spectators never
+        # delays the captains' frames.
+        self._push_all(
+            [
+                client
+                for pool in (self.active_connections, self.viewer_connections)
+                for clients in pool.values()
+                for client in clients
+            ],
+            message,
+        )
+
+    def broadcast_to(self, auction_id: str, message: dict[str, Any]) -> None:
+        connections = [
+            *self.active_connections.get(auction_id, ()),
+            *self.viewer_connections.get(auction_id, ()),
+        ]
+        if connections:
+            self._push_all(connections, message)
+
+    def _push_all(self, connections: list[ClientConnection], message: dict[str, Any]) -> None:
+        coalesce = _coalesce_key(message, COALESCED_EVENTS)
+        viewer_coalesce = _coalesce_key(message, VIEWER_COALESCED_EVENTS)
+        frames: dict[str, tuple[bytes, dict[int, str]] | None] = {}
+        text: str | None = None
+        lagging = []
+        for client in connections:
+            key = viewer_coalesce if client.viewer else coalesce
+            if client.binary:
+                if client.key not in frames:
+                    interner = self.interners.setdefault(client.key, Interner())
+                    frames[client.key] = encode_binary(message, interner)
+                frame = frames[client.key]
+                if frame is not None:
+                    if not self._push_binary(client, frame, key):
+                        lagging.append(client)
+                    continue
+            if text is None:
+                text = encode_json(message)
+            if not client.push(text, key):
+                lagging.append(client)
+        for client in lagging:
+            self.disconnect(client.websocket, LAGGING_CLOSE_CODE)
+
+    def _push_binary(
+        self, client: ClientConnection, frame: tuple[bytes, dict[int, str]], coalesce: str | None
+    ) -> bool:
+        data, strings = frame
+        # Refs are announced once per connection, ahead of the first frame using them.
+        unknown = {str(ref): value for ref, value in strings.items() if ref not in client.known}
+        if unknown:
+            if not client.push(encode_json({"event": "intern", "payload": unknown})):
+                return False
+            client.known.update(strings)
+        return client.push(data, coalesce)
+
+
+def _coalesce_key(message: dict[str, Any], events: set[str]) -> str | None:
+    event = message.get("event")
+    return event if event in events else None
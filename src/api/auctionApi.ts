@@ -9,8 +9,10 @@ export type JoinLobbyPayload = {
 }
 
 export type StartGamePayload = {
-  playerList: Array<{ id?: string; name: string; tiers: Player['tiers'] }>
-  orderType: 'seq' | 'rand'
+  playerList?: Array<{ id?: string; name: string; tiers: Player['tiers'] }>
+  orderType: 'seq' | 'rand' | 'snake' | 'interleave' | 'strongest'
+  seed?: number
+  autoHammer?: boolean
 }
 
 export function listPlayers() {
@@ -43,6 +45,10 @@ export function adminLogin(id: string, password: string) {
   return post<{ token: string }>('/auth/login', { id, password })
 }
 
+export function adminLogout() {
+  return post<void>('/auth/logout')
+}
+
 export function validateInvite(code: string) {
   return get<{ valid: boolean; auctionId?: string }>(`/invite/validate/${code}`)
 }
@@ -92,8 +98,8 @@ export function getGameState() {
   return get<GameState>('/game/state')
 }
 
-export function bid(teamId: string, amount: number) {
-  return post<GameState>('/game/bid', { teamId, amount })
+export function bid(teamId: string, amount: number, expectedVersion?: number) {
+  return post<GameState>('/game/bid', { teamId, amount, expectedVersion })
 }
 
 export function adminTimer(action: 'start' | 'pause' | 'reset', value?: number) {
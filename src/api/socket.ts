@@ -1,25 +1,331 @@
 import { WS_BASE } from './client'
+import type { GameState, Player, Team } from '../types'
 
 export type AuctionEvent = {
   event: string
   payload: unknown
 }
 
+type LobbySnapshot = {
+  auctionId?: string
+  version?: number
+  players: Player[]
+  teams: Team[]
+}
+
+type LobbyOp =
+  | { op: 'player_upsert'; player: Player }
+  | { op: 'player_remove'; playerId: string }
+  | { op: 'team_upsert'; team: Team }
+  | { op: 'team_remove'; teamId: string }
+  | { op: 'team_points'; teamId: string; points: number }
+
+type LobbyPatch = {
+  auctionId?: string
+  version: number
+  ops: LobbyOp[]
+}
+
+type SocketAck = {
+  id: number
+  ok: boolean
+  status?: number
+  detail?: unknown
+  state?: GameState
+}
+
+type PendingRequest = {
+  resolve: (ack: SocketAck) => void
+  reject: (error: Error) => void
+}
+
+type Pong = {
+  t0?: number
+  receivedAt: number
+  serverTime: number
+}
+
+const CLOCK_SYNC_BURST = 5
+const CLOCK_SYNC_INTERVAL_MS = 30000
+
+type ClockSync = {
+  offsetMs: number
+  rttMs: number
+}
+
+function serverNow(clock: ClockSync) {
+  return Date.now() + clock.offsetMs
+}
+
+function timeLeftUntil(clock: ClockSync, endsAt: number | null | undefined) {
+  if (endsAt == null) return null
+  return Math.max(0, endsAt - serverNow(clock) / 1000)
+}
+
+const TIMER_SYNC_KIND = 1
+const BID_UPDATE_KIND = 2
+
+// Mirrors the fixed layouts in api/codec.py (little-endian, no padding).
+function decodeBinary(
+  buffer: ArrayBuffer,
+  interned: Map<number, string>,
+): AuctionEvent | null {
+  const view = new DataView(buffer)
+  const kind = view.getUint8(0)
+  const auctionId = interned.get(view.getUint32(1, true))
+  if (kind === TIMER_SYNC_KIND) {
+    const endsAt = view.getFloat64(10, true)
+    return {
+      event: 'timer_sync',
+      payload: {
+        auctionId,
+        timeLeft: view.getFloat32(5, true),
+        isRunning: view.getUint8(9) === 1,
+        endsAt: Number.isNaN(endsAt) ? null : endsAt,
+      },
+    }
+  }
+  if (kind === BID_UPDATE_KIND) {
+    const highBidderName = interned.get(view.getUint32(9, true)) ?? ''
+    const currentBid = view.getUint32(13, true)
+    return {
+      event: 'bid_update',
+      payload: {
+        auctionId,
+        highBidder: interned.get(view.getUint32(5, true)),
+        highBidderName,
+        currentBid,
+        log: `${highBidderName} bid ${currentBid}`,
+        version: view.getUint32(17, true),
+      },
+    }
+  }
+  return null
+}
+
+const pendingRequests = new WeakMap<WebSocket, Map<number, PendingRequest>>()
+let nextRequestId = 1
+
+type LobbyMirror = {
+  auctionId?: string
+  version: number
+  players: Map<string, Player>
+  teams: Map<string, Team>
+}
+
+function loadLobby(snapshot: LobbySnapshot): LobbyMirror {
+  return {
+    auctionId: snapshot.auctionId,
+    version: snapshot.version ?? 0,
+    players: new Map((snapshot.players ?? []).map((player) => [player.id, player])),
+    teams: new Map(
+      (snapshot.teams ?? []).map((team) => [team.id, { ...team, roster: [] }]),
+    ),
+  }
+}
+
+function applyLobbyOp(lobby: LobbyMirror, op: LobbyOp) {
+  if (op.op === 'player_upsert') {
+    lobby.players.set(op.player.id, op.player)
+  } else if (op.op === 'player_remove') {
+    lobby.players.delete(op.playerId)
+  } else if (op.op === 'team_upsert') {
+    lobby.teams.set(op.team.id, { ...op.team, roster: [] })
+  } else if (op.op === 'team_remove') {
+    lobby.teams.delete(op.teamId)
+  } else if (op.op === 'team_points') {
+    const team = lobby.teams.get(op.teamId)
+    if (team) {
+      lobby.teams.set(op.teamId, { ...team, points: op.points })
+    }
+  }
+}
+
+function lobbySnapshot(lobby: LobbyMirror): LobbySnapshot {
+  const players = [...lobby.players.values()].sort(
+    (a, b) =>
+      (a.orderIndex ?? Number.MAX_SAFE_INTEGER) -
+      (b.orderIndex ?? Number.MAX_SAFE_INTEGER),
+  )
+  const teams = [...lobby.teams.values()].map((team) => ({
+    ...team,
+    roster: players.filter((player) => player.soldToTeamId === team.id),
+  }))
+  return { auctionId: lobby.auctionId, version: lobby.version, players, teams }
+}
+
+export function sendSocketRequest(
+  socket: WebSocket,
+  message: Record<string, unknown>,
+): Promise<SocketAck> {
+  return new Promise((resolve, reject) => {
+    if (socket.readyState !== WebSocket.OPEN) {
+      reject(new Error('Socket is not open'))
+      return
+    }
+    const id = nextRequestId++
+    let pending = pendingRequests.get(socket)
+    if (!pending) {
+      pending = new Map()
+      pendingRequests.set(socket, pending)
+    }
+    pending.set(id, { resolve, reject })
+    socket.send(JSON.stringify({ ...message, id }))
+  })
+}
+
+export async function bidOverSocket(
+  socket: WebSocket,
+  teamId: string,
+  amount: number,
+  expectedVersion?: number,
+): Promise<GameState> {
+  const ack = await sendSocketRequest(socket, {
+    type: 'bid',
+    teamId,
+    amount,
+    expectedVersion,
+  })
+  if (!ack.ok || !ack.state) {
+    throw new Error(JSON.stringify({ detail: ack.detail }))
+  }
+  return ack.state
+}
+
 export function connectAuctionSocket(
   onEvent: (event: AuctionEvent) => void,
   auctionId?: string,
+  role?: 'viewer',
 ) {
-  const query = auctionId ? `?auctionId=${encodeURIComponent(auctionId)}` : ''
-  const socket = new WebSocket(`${WS_BASE}/ws${query}`)
+  const params = new URLSearchParams({ proto: 'binary' })
+  if (auctionId) params.set('auctionId', auctionId)
+  if (role) params.set('role', role)
+  const socket = new WebSocket(`${WS_BASE}/ws?${params}`)
+  socket.binaryType = 'arraybuffer'
+  const interned = new Map<number, string>()
+  let lobby: LobbyMirror | null = null
+  let resyncPending = false
+  const clock: ClockSync = { offsetMs: 0, rttMs: Number.POSITIVE_INFINITY }
+  let clockTimer: ReturnType<typeof setInterval> | null = null
+
+  const sendPing = () => {
+    if (socket.readyState !== WebSocket.OPEN) return
+    socket.send(JSON.stringify({ type: 'ping', t0: Date.now() }))
+  }
+
+  const syncClock = () => {
+    for (let i = 0; i < CLOCK_SYNC_BURST; i += 1) {
+      setTimeout(sendPing, i * 100)
+    }
+  }
+
+  const applyPong = (pong: Pong) => {
+    if (typeof pong.t0 !== 'number') return
+    const t3 = Date.now()
+    const t1 = pong.receivedAt * 1000
+    const t2 = pong.serverTime * 1000
+    const rtt = t3 - pong.t0 - (t2 - t1)
+    // Keep the sample with the smallest round trip; it has the least
+    // asymmetric network delay folded into the offset.
+    if (rtt <= clock.rttMs) {
+      clock.rttMs = rtt
+      clock.offsetMs = (t1 - pong.t0 + (t2 - t3)) / 2
+    }
+  }
+
+  const requestResync = () => {
+    if (resyncPending || socket.readyState !== WebSocket.OPEN) return
+    resyncPending = true
+    socket.send(JSON.stringify({ type: 'lobby_resync' }))
+  }
+
+  const handle = (parsed: AuctionEvent) => {
+    if (parsed.event === 'ack') {
+      const ack = parsed.payload as SocketAck
+      const pending = pendingRequests.get(socket)
+      pending?.get(ack.id)?.resolve(ack)
+      pending?.delete(ack.id)
+      return
+    }
+    if (parsed.event === 'intern') {
+      Object.entries(parsed.payload as Record<string, string>).forEach(([ref, value]) => {
+        interned.set(Number(ref), value)
+      })
+      return
+    }
+    if (parsed.event === 'pong') {
+      applyPong(parsed.payload as Pong)
+      return
+    }
+    if (parsed.event === 'timer_sync') {
+      const payload = parsed.payload as { timeLeft: number; endsAt?: number | null }
+      const timeLeft = timeLeftUntil(clock, payload.endsAt)
+      onEvent(
+        timeLeft === null ? parsed : { ...parsed, payload: { ...payload, timeLeft } },
+      )
+      return
+    }
+    if (parsed.event === 'state_sync') {
+      const payload = parsed.payload as GameState
+      const timerValue = timeLeftUntil(clock, payload.endsAt)
+      onEvent(
+        timerValue === null ? parsed : { ...parsed, payload: { ...payload, timerValue } },
+      )
+      return
+    }
+    if (parsed.event === 'lobby_update') {
+      const snapshot = parsed.payload as LobbySnapshot
+      // Several server processes can publish snapshots that cross on the way.
+      if (lobby && (snapshot.version ?? 0) < lobby.version) return
+      lobby = loadLobby(snapshot)
+      resyncPending = false
+      onEvent({ event: 'lobby_update', payload: lobbySnapshot(lobby) })
+      return
+    }
+    if (parsed.event === 'lobby_patch') {
+      const patch = parsed.payload as LobbyPatch
+      if (!lobby || patch.version <= lobby.version) return
+      if (patch.version !== lobby.version + 1) {
+        requestResync()
+        return
+      }
+      patch.ops.forEach((op) => applyLobbyOp(lobby as LobbyMirror, op))
+      lobby.version = patch.version
+      onEvent({ event: 'lobby_update', payload: lobbySnapshot(lobby) })
+      return
+    }
+    onEvent(parsed)
+  }
 
   socket.addEventListener('message', (message) => {
     try {
+      if (message.data instanceof ArrayBuffer) {
+        const decoded = decodeBinary(message.data, interned)
+        if (decoded) handle(decoded)
+        return
+      }
       const parsed = JSON.parse(message.data) as AuctionEvent
-      onEvent(parsed)
+      handle(parsed)
     } catch {
       // Ignore malformed messages.
     }
   })
 
+  socket.addEventListener('open', () => {
+    syncClock()
+    clockTimer = setInterval(syncClock, CLOCK_SYNC_INTERVAL_MS)
+  })
+
+  socket.addEventListener('close', () => {
+    if (clockTimer !== null) {
+      clearInterval(clockTimer)
+      clockTimer = null
+    }
+    pendingRequests.get(socket)?.forEach((pending) => {
+      pending.reject(new Error('Socket closed'))
+    })
+    pendingRequests.delete(socket)
+  })
+
   return socket
 }
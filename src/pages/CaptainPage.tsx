@@ -1,11 +1,11 @@
-import { useEffect, useMemo, useState } from 'react'
+import { useEffect, useMemo, useRef, useState } from 'react'
 import AuctionStage from '../components/AuctionStage'
 import BidPanel from '../components/BidPanel'
 import LogBox from '../components/LogBox'
 import RosterGrid from '../components/RosterGrid'
 import TeamCard from '../components/TeamCard'
 import { bid, getGameState, listPlayers, listTeams } from '../api/auctionApi'
-import { connectAuctionSocket } from '../api/socket'
+import { bidOverSocket, connectAuctionSocket } from '../api/socket'
 import type { GameState, Player, Team } from '../types'
 import useSyncedTimer from '../hooks/useSyncedTimer'
 
@@ -14,6 +14,7 @@ export default function CaptainPage() {
   const [teams, setTeams] = useState<Team[]>([])
   const [players, setPlayers] = useState<Player[]>([])
   const [state, setState] = useState<GameState | null>(null)
+  const socketRef = useRef<WebSocket | null>(null)
   const auctionId = localStorage.getItem('auctionId') ?? undefined
 
   const currentPlayer = state?.currentPlayer ?? null
@@ -121,6 +122,7 @@ export default function CaptainPage() {
           highBidder: string
           highBidderName?: string
           log?: string
+          version?: number
         }
         const bidderName =
           payload.highBidderName ??
@@ -143,6 +145,7 @@ export default function CaptainPage() {
                 bidHistory: payload.log
                   ? [payload.log, ...prev.bidHistory]
                   : prev.bidHistory,
+                version: payload.version ?? prev.version,
               }
             : prev,
         )
@@ -156,9 +159,11 @@ export default function CaptainPage() {
         getGameState().then(setState).catch(() => {})
       }
     }, auctionId)
+    socketRef.current = socket
 
     return () => {
       isMounted = false
+      socketRef.current = null
       socket.close()
       window.removeEventListener('popstate', blockBack)
     }
@@ -192,10 +197,15 @@ export default function CaptainPage() {
       return
     }
     try {
-      const nextState = await bid(myTeam.id, pendingAdd)
+      const socket = socketRef.current
+      const nextState =
+        socket && socket.readyState === WebSocket.OPEN
+          ? await bidOverSocket(socket, myTeam.id, pendingAdd, state?.version)
+          : await bid(myTeam.id, pendingAdd, state?.version)
       setState(nextState)
       setPendingAdd(0)
     } catch (error) {
+      getGameState().then(setState).catch(() => {})
       alert(String(error))
     }
   }
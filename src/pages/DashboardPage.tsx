@@ -1,5 +1,5 @@
 import { useEffect, useState } from 'react'
-import { createAuction, listAuctions } from '../api/auctionApi'
+import { adminLogout, createAuction, listAuctions } from '../api/auctionApi'
 
 type AuctionItem = {
   id: string
@@ -56,6 +56,7 @@ export default function DashboardPage() {
             className="logout-btn"
             type="button"
             onClick={() => {
+              adminLogout().catch(() => {})
               localStorage.removeItem('adminToken')
               window.location.hash = '#/login'
             }}
@@ -11,6 +11,7 @@ import {
   startGame,
   updateTeamPoints,
 } from '../api/auctionApi'
+import type { StartGamePayload } from '../api/auctionApi'
 import { connectAuctionSocket } from '../api/socket'
 import type { Player, Team } from '../types'
 
@@ -27,7 +28,8 @@ export default function SetupPage() {
   const [mode, setMode] = useState<'manual' | 'auto'>('manual')
   const [manualForm, setManualForm] = useState(initialForm)
   const [logText, setLogText] = useState('')
-  const [orderType, setOrderType] = useState<'seq' | 'rand'>('seq')
+  const [orderType, setOrderType] = useState<StartGamePayload['orderType']>('seq')
+  const [autoHammer, setAutoHammer] = useState(false)
   const [players, setPlayers] = useState<Player[]>([])
   const [teams, setTeams] = useState<Team[]>([])
 
@@ -282,6 +284,45 @@ export default function SetupPage() {
                 />
                 랜덤 진행
               </label>
+              <label>
+                <input
+                  type="radio"
+                  name="order"
+                  checked={orderType === 'snake'}
+                  onChange={() => setOrderType('snake')}
+                />
+                티어 스네이크
+              </label>
+              <label>
+                <input
+                  type="radio"
+                  name="order"
+                  checked={orderType === 'interleave'}
+                  onChange={() => setOrderType('interleave')}
+                />
+                포지션 교차
+              </label>
+              <label>
+                <input
+                  type="radio"
+                  name="order"
+                  checked={orderType === 'strongest'}
+                  onChange={() => setOrderType('strongest')}
+                />
+                상위 티어 우선
+              </label>
+            </div>
+
+            <label className="field-label">낙찰 방식</label>
+            <div className="radio-group">
+              <label>
+                <input
+                  type="checkbox"
+                  checked={autoHammer}
+                  onChange={(event) => setAutoHammer(event.target.checked)}
+                />
+                타이머 종료 시 자동 낙찰
+              </label>
             </div>
 
             <label className="field-label">초대 링크</label>
@@ -297,12 +338,8 @@ export default function SetupPage() {
               onClick={async () => {
                 try {
                   await startGame({
-                    playerList: players.map((player) => ({
-                      id: player.id,
-                      name: player.name,
-                      tiers: player.tiers,
-                    })),
                     orderType,
+                    autoHammer,
                   })
                   window.location.hash = '#/streamer'
                 } catch (error) {
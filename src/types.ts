@@ -10,7 +10,9 @@ export type Player = {
   name: string
   tiers: PlayerTier
   status?: 'waiting' | 'bidding' | 'sold' | 'unsold'
-  orderIndex?: number
+  soldToTeamId?: string | null
+  soldPrice?: number | null
+  orderIndex?: number | null
 }
 
 export type Team = {
@@ -38,4 +40,7 @@ export type GameState = {
   timerValue: number
   isTimerRunning: boolean
   bidHistory: string[]
+  version?: number
+  endsAt?: number | null
+  autoHammer?: boolean
 }